@@ -0,0 +1,92 @@
+# Benchmark -- headless immersive_room rendering (frames/sec + frame times)
+# Usage: python examples/bench_immersive_room.py [--frames N] [--width W --height H]
+#        [--sprites S] [--renderer full dirty] [--json out.json]
+# Runs the room loop uncapped on the dummy SDL driver with a scripted input
+# trace and one simulation step per frame, so runs are repeatable on a
+# CPU-only box and renderer modes can be compared before deploy.
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import immersive_room as room
+
+# (sim steps, keys held): the avatar walks a square, then idles.
+DEFAULT_TRACE = [
+    (30, ("K_RIGHT",)), (30, ("K_DOWN",)), (30, ("K_LEFT",)), (30, ("K_UP",)), (20, ()),
+]
+
+
+class _Keys:
+    def __init__(self, held):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def scripted_keys(trace):
+    """keys_fn for run_loop that replays ``trace`` cyclically, one entry per sim step."""
+    steps = [_Keys(getattr(pygame, k) for k in keys) for count, keys in trace for _ in range(count)]
+    state = {"i": 0}
+
+    def keys_fn():
+        keys = steps[state["i"] % len(steps)]
+        state["i"] += 1
+        return keys
+
+    return keys_fn
+
+
+def run(renderer_name, frames, width, height, sprites, trace=DEFAULT_TRACE, seed=0):
+    pygame.display.init()
+    try:
+        screen = pygame.display.set_mode((width, height))
+        renderer = room.RENDERERS[renderer_name](screen, room.make_background(width, height))
+        avatar = room.Sprite(width // 2, height // 2)
+        started = time.perf_counter()
+        profiler = room.run_loop(
+            renderer, avatar, room.make_sprites(sprites, width, height, seed), width, height,
+            seconds=None, max_frames=frames, fps=0, keys_fn=scripted_keys(trace), frame_dt=room.SIM_STEP,
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        pygame.display.quit()
+    summary = profiler.summary()
+    summary.update(renderer=renderer_name, width=width, height=height, sprites=sprites,
+                   seconds=round(elapsed, 4), fps=round(summary["frames"] / elapsed, 1))
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark immersive_room rendering headless.")
+    parser.add_argument("--frames", type=int, default=600, help="Frames per run.")
+    parser.add_argument("--width", type=int, default=room.WIDTH, help="Room width in pixels.")
+    parser.add_argument("--height", type=int, default=room.HEIGHT, help="Room height in pixels.")
+    parser.add_argument("--sprites", type=int, default=0, help="Extra wandering sprites.")
+    parser.add_argument("--renderer", nargs="+", choices=sorted(room.RENDERERS), default=["full", "dirty"])
+    parser.add_argument("--trace", help="JSON list of [steps, [key names]] replacing the default walk.")
+    parser.add_argument("--json", help="Also write the results here.")
+    args = parser.parse_args(argv)
+
+    trace = DEFAULT_TRACE
+    if args.trace:
+        with open(args.trace, "r", encoding="utf-8") as f:
+            trace = [(count, tuple(keys)) for count, keys in json.load(f)]
+    results = [run(name, args.frames, args.width, args.height, args.sprites, trace) for name in args.renderer]
+    for r in results:
+        frame = r["frame"]
+        print(f"{r['renderer']:>5} {r['width']}x{r['height']} sprites={r['sprites']:<5} "
+              f"{r['fps']:>9.1f} fps  frame ms p50 {frame['p50']:.3f} p95 {frame['p95']:.3f} "
+              f"p99 {frame['p99']:.3f} max {frame['max']:.3f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
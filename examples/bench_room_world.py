@@ -0,0 +1,62 @@
+# Benchmark -- portal proximity queries: spatial hash vs. linear scan
+# Usage: python examples/bench_room_world.py [--counts 10 100 1000 10000]
+#        [--queries Q] [--radius R] [--json out.json]
+# Portals keep the deployed density (one 48 px portal per ~96 px cell), so
+# the room grows with the portal count; a query near the avatar should
+# cost the same at 10 portals as at 10,000 while the scan grows linearly.
+import argparse
+import json
+import math
+import random
+import time
+
+from room_world import RoomWorld
+
+CELL_PITCH = 96
+
+
+def make_world(count, cell_size=64):
+    side = max(1, math.ceil(math.sqrt(count))) * CELL_PITCH
+    records = [{"id": f"portal-{i}"} for i in range(count)]
+    return RoomWorld.from_records(records, side, side, cell_size=cell_size)
+
+
+def _scan(portals, x, y, radius):
+    return [p for p in portals if p.distance_to(x, y) <= radius]
+
+
+def run(count, queries=20000, radius=24, seed=0):
+    world = make_world(count)
+    rng = random.Random(seed)
+    points = [(rng.uniform(0, world.width), rng.uniform(0, world.height)) for _ in range(queries)]
+    portals = list(world.portals.values())
+    scan_points = points[: max(1, queries * 10 // max(count, 10))]
+
+    started = time.perf_counter()
+    hits = sum(len(world.near(x, y, radius)) for x, y in points)
+    grid = (time.perf_counter() - started) / len(points)
+    started = time.perf_counter()
+    scan_hits = sum(len(_scan(portals, x, y, radius)) for x, y in scan_points)
+    scan = (time.perf_counter() - started) / len(scan_points)
+    return {"portals": count, "queries": queries, "grid_us": round(grid * 1e6, 3),
+            "scan_us": round(scan * 1e6, 3), "hits": hits, "scan_hits": scan_hits}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark room_world portal queries.")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 10000], help="Portal counts.")
+    parser.add_argument("--queries", type=int, default=20000, help="Proximity queries per count.")
+    parser.add_argument("--radius", type=float, default=24, help="Query radius in pixels.")
+    parser.add_argument("--json", help="Also write the results here.")
+    args = parser.parse_args(argv)
+
+    results = [run(n, args.queries, args.radius) for n in args.counts]
+    for r in results:
+        print(f"{r['portals']:>6} portals  grid {r['grid_us']:>8.2f} us/query  scan {r['scan_us']:>9.2f} us/query")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
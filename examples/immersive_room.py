@@ -1,59 +1,408 @@
+import argparse
+import json
 import os
 import math
+import random
+import time
 import numpy as np
 import pygame
 
+from room_audio import CardMixer, MixerOutput, load_card_freqs, region_index
+from room_tiles import ArtTiles, ProceduralTiles, TiledRenderer, catalog_images
+from room_world import RoomWorld, load_portal_records, portal_hook
+
 # Use a headless video driver if no display is available
 os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 
-# Initialize pygame modules and audio
-pygame.init()
-pygame.mixer.init(frequency=44100)
+# Card registry whose freq values score the room, one region per card
+CARDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "data", "cards.json")
+# Optimizer catalog whose assets/img variants can tile large floors
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "ASSET_CATALOG.json")
 
 # Screen dimensions for the exploratory room
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Immersive Creative Room")
-
-# Create a simple gradient background representing wall art
-background = pygame.Surface((WIDTH, HEIGHT))
-for y in range(HEIGHT):
-    color = (y * 255 // HEIGHT, 0, 128)
-    pygame.draw.line(background, color, (0, y), (WIDTH, y))
-
-# Generate a looping sine wave tone as placeholder music
-sample_rate = 44100
-seconds = 2
-samples = np.linspace(0, seconds, int(sample_rate * seconds), False)
-tone = (np.sin(2 * math.pi * 440 * samples) * 32767).astype(np.int16)
-sound = pygame.sndarray.make_sound(tone)
-sound.play(-1)
-
-# Avatar starting position
-x, y = WIDTH // 2, HEIGHT // 2
-clock = pygame.time.Clock()
-frames = 0
-running = True
-
-# Main exploration loop (auto-exits after ~2 seconds)
-while running and frames < 120:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
+# Simulation runs at a fixed 60 Hz step; speeds are pixels per step.
+SIM_STEP = 1 / 60
+AVATAR_SPEED = 5
+# Longest wall-clock gap fed to the simulation in one frame, so a stall
+# does not trigger a burst of catch-up steps.
+MAX_FRAME_TIME = 0.25
+# How close (pixels) the avatar must be to a portal hitbox to focus it
+PORTAL_RADIUS = 24
+
+
+class Sprite:
+    """A filled circle that can drift and bounce inside the room."""
+
+    def __init__(self, x, y, radius=10, color=(255, 255, 255), vx=0, vy=0):
+        self.x, self.y = x, y
+        self.prev_x, self.prev_y = x, y
+        self.radius = radius
+        self.color = color
+        self.vx, self.vy = vx, vy
+
+    def save(self):
+        """Remember the current position as the start of the next step."""
+        self.prev_x, self.prev_y = self.x, self.y
+
+    def step(self, width, height):
+        self.x += self.vx
+        self.y += self.vy
+        if not self.radius <= self.x <= width - self.radius:
+            self.vx = -self.vx
+        if not self.radius <= self.y <= height - self.radius:
+            self.vy = -self.vy
+
+    def draw(self, surface, alpha=1.0, offset=(0, 0)):
+        """Draw at ``alpha`` between the last two steps, shifted by ``offset``; return the rect that changed."""
+        x = self.prev_x + (self.x - self.prev_x) * alpha + offset[0]
+        y = self.prev_y + (self.y - self.prev_y) * alpha + offset[1]
+        return pygame.draw.circle(surface, self.color, (int(x), int(y)), self.radius)
+
+
+class FullRenderer:
+    """Blit the whole background and flip every frame."""
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+
+    def draw(self, sprites, alpha=1.0):
+        self.screen.blit(self.background, (0, 0))
+        for sprite in sprites:
+            sprite.draw(self.screen, alpha)
+
+    def present(self, _dirty=None):
+        pygame.display.flip()
+
+    def render(self, sprites, alpha=1.0):
+        self.present(self.draw(sprites, alpha))
+
+
+class DirtyRectRenderer:
+    """Repaint only what moved.
+
+    Each frame restores the background under every sprite's previous rect,
+    draws the sprites, and hands ``display.update`` the union of old and new
+    rect per sprite, so work follows sprite area rather than screen size.
+    """
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self._prev = []
+        screen.blit(background, (0, 0))
+        pygame.display.flip()
+
+    def draw(self, sprites, alpha=1.0):
+        # Restore everything first so no restore erases a freshly drawn sprite.
+        for rect in self._prev:
+            self.screen.blit(self.background, rect, rect)
+        drawn = [sprite.draw(self.screen, alpha) for sprite in sprites]
+        dirty = [new.union(old) for new, old in zip(drawn, self._prev)]
+        dirty += drawn[len(self._prev):] + self._prev[len(drawn):]
+        self._prev = drawn
+        return dirty
+
+    def present(self, dirty):
+        pygame.display.update(dirty)
+
+    def render(self, sprites, alpha=1.0):
+        self.present(self.draw(sprites, alpha))
+
+
+class FrameProfiler:
+    """Per-frame update/render/flip timings with percentile summaries."""
+
+    PHASES = ("update", "render", "flip", "frame")
+
+    def __init__(self):
+        self.samples = {phase: [] for phase in self.PHASES}
+        self.sim_steps = 0
+
+    def record(self, update, render, flip):
+        for phase, value in zip(self.PHASES, (update, render, flip, update + render + flip)):
+            self.samples[phase].append(value)
+
+    def summary(self):
+        """Milliseconds per phase: mean, p50, p95, p99 and max."""
+        out = {"frames": len(self.samples["frame"]), "sim_steps": self.sim_steps}
+        for phase, values in self.samples.items():
+            if not values:
+                continue
+            ms = np.asarray(values) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            out[phase] = {
+                "mean": round(float(ms.mean()), 4), "p50": round(float(p50), 4),
+                "p95": round(float(p95), 4), "p99": round(float(p99), 4), "max": round(float(ms.max()), 4),
+            }
+        return out
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+RENDERERS = {"full": FullRenderer, "dirty": DirtyRectRenderer}
+
+
+# Wall gradient endpoints (top row, bottom row)
+DEFAULT_GRADIENT = ((0, 0, 128), (255, 0, 128))
+# On-disk background cache cap; a 4K entry is ~25 MB of raw RGB.
+BACKGROUND_CACHE_BYTES = 256 << 20
+_BACKGROUNDS = {}
+
+
+def gradient_column(height, palette=DEFAULT_GRADIENT):
+    """Per-scanline colors: integer lerp from top to bottom, (height, 3) uint8."""
+    top, bottom = (np.array(c, dtype=np.int64) for c in palette)
+    y = np.arange(height, dtype=np.int64)[:, None]
+    return (top + (bottom - top) * y // height).astype(np.uint8)
+
+
+def evict_backgrounds(cache_dir, max_bytes=BACKGROUND_CACHE_BYTES, keep=None):
+    """Drop least recently used cached backgrounds until ``cache_dir`` fits ``max_bytes``."""
+    entries, total = [], 0
+    with os.scandir(cache_dir) as it:
+        for e in it:
+            if not (e.name.startswith("gradient_") and e.name.endswith(".rgb")):
+                continue
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, e.path, st.st_size))
+            total += st.st_size
+    for _, path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def make_background(width, height, palette=DEFAULT_GRADIENT, cache_dir=None,
+                    max_bytes=BACKGROUND_CACHE_BYTES):
+    """Gradient wall art for a room, built with one surfarray write.
+
+    Surfaces are memoized per (size, palette) so several rooms share one,
+    and with ``cache_dir`` the raw pixels are kept on disk between runs,
+    evicting least recently used entries past ``max_bytes``.
+    """
+    palette = tuple(tuple(int(v) for v in c) for c in palette)
+    key = (width, height, palette)
+    if key in _BACKGROUNDS:
+        return _BACKGROUNDS[key]
+    path = None
+    if cache_dir:
+        tag = "_".join("%02x%02x%02x" % c for c in palette)
+        path = os.path.join(cache_dir, f"gradient_{width}x{height}_{tag}.rgb")
+    if path and os.path.exists(path):
+        with open(path, "rb") as f:
+            background = pygame.image.frombytes(f.read(), (width, height), "RGB")
+        os.utime(path)  # mark as recently used for eviction
+    else:
+        # Create a simple gradient background representing wall art
+        background = pygame.Surface((width, height), depth=32)
+        column = gradient_column(height, palette)
+        mapped = np.array([background.map_rgb(tuple(c)) for c in column], dtype=np.uint32)
+        pixels = pygame.surfarray.pixels2d(background)
+        pixels[:] = mapped[None, :]
+        del pixels  # release the surface lock
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(pygame.image.tobytes(background, "RGB"))
+            os.replace(tmp, path)
+            evict_backgrounds(cache_dir, max_bytes, keep=path)
+    _BACKGROUNDS[key] = background
+    return background
+
+
+def make_sprites(count, width, height, seed=0):
+    """Extra wandering sprites; seeded so runs are comparable."""
+    rng = random.Random(seed)
+    return [
+        Sprite(
+            rng.randint(10, width - 10), rng.randint(10, height - 10), radius=6,
+            color=(rng.randint(64, 255), rng.randint(64, 255), rng.randint(64, 255)),
+            vx=rng.choice((-3, -2, 2, 3)), vy=rng.choice((-3, -2, 2, 3)),
+        )
+        for _ in range(count)
+    ]
+
+
+def start_music(cards_path=None, width=WIDTH, height=HEIGHT):
+    """Start the room's music; returns a per-frame hook taking the avatar, or None.
+
+    With a cards registry the room is split into one region per card and a
+    :class:`CardMixer` crossfades to the card tone under the avatar;
+    otherwise a looping 440 Hz tone plays as placeholder music.
+    """
+    try:
+        pygame.mixer.init(frequency=44100)
+    except pygame.error:
+        return None  # no audio device (e.g. CI container): explore in silence
+    sample_rate, _, channels = pygame.mixer.get_init()
+    freqs = load_card_freqs(cards_path) if cards_path and os.path.exists(cards_path) else []
+    if freqs:
+        mixer = CardMixer(freqs, sample_rate=sample_rate, channels=channels)
+        output = MixerOutput(mixer)
+        current = [object()]
+
+        def hook(avatar):
+            idx = region_index(avatar.x, avatar.y, width, height, len(freqs))
+            freq = freqs[idx] if idx is not None else None
+            if freq != current[0]:
+                mixer.focus(freq)
+                current[0] = freq
+            output.pump()
+
+        return hook
+    # Generate a looping sine wave tone as placeholder music
+    seconds = 2
+    samples = np.linspace(0, seconds, int(sample_rate * seconds), False)
+    tone = (np.sin(2 * math.pi * 440 * samples) * 32767).astype(np.int16)
+    if channels == 2:
+        tone = np.column_stack([tone, tone])
+    sound = pygame.sndarray.make_sound(tone)
+    sound.play(-1)
+    return None
+
+
+def run_loop(renderer, avatar, sprites, width, height, seconds=2.0, max_frames=None, fps=60,
+             keys_fn=None, profiler=None, frame_dt=None, hooks=()):
+    """Fixed-timestep exploration loop with interpolated rendering.
+
+    Input and movement advance in ``SIM_STEP`` increments however long a
+    frame takes; rendering draws between the last two steps. Stops after
+    ``seconds`` of simulated time or ``max_frames`` rendered frames
+    (whichever is set and comes first); ``fps=0`` runs uncapped.
+    ``frame_dt`` feeds a fixed amount of simulated time per frame instead
+    of wall-clock time, making benchmark runs deterministic. Each of
+    ``hooks`` is called with the avatar once per frame (e.g. music).
+    """
+    keys_fn = keys_fn or pygame.key.get_pressed
+    profiler = profiler or FrameProfiler()
+    max_steps = None if seconds is None else round(seconds / SIM_STEP)
+    clock = pygame.time.Clock()
+    movers = [s for s in sprites if s is not avatar]
+    everyone = [avatar] + movers
+    accumulator, frames, steps = 0.0, 0, 0
+    last = time.perf_counter()
+    running = True
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        now = time.perf_counter()
+        accumulator += frame_dt if frame_dt is not None else min(now - last, MAX_FRAME_TIME)
+        last = now
+
+        while accumulator >= SIM_STEP and (max_steps is None or steps < max_steps):
+            for sprite in everyone:
+                sprite.save()
+            keys = keys_fn()
+            if keys[pygame.K_LEFT]:
+                avatar.x -= AVATAR_SPEED
+            if keys[pygame.K_RIGHT]:
+                avatar.x += AVATAR_SPEED
+            if keys[pygame.K_UP]:
+                avatar.y -= AVATAR_SPEED
+            if keys[pygame.K_DOWN]:
+                avatar.y += AVATAR_SPEED
+            for sprite in movers:
+                sprite.step(width, height)
+            accumulator -= SIM_STEP
+            steps += 1
+        for hook in hooks:
+            hook(avatar)
+        t_update = time.perf_counter()
+
+        dirty = renderer.draw(everyone, min(accumulator / SIM_STEP, 1.0))
+        t_render = time.perf_counter()
+        renderer.present(dirty)
+        t_flip = time.perf_counter()
+        profiler.record(t_update - now, t_render - t_update, t_flip - t_render)
+
+        frames += 1
+        if max_steps is not None and steps >= max_steps:
             running = False
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT]:
-        x -= 5
-    if keys[pygame.K_RIGHT]:
-        x += 5
-    if keys[pygame.K_UP]:
-        y -= 5
-    if keys[pygame.K_DOWN]:
-        y += 5
-
-    screen.blit(background, (0, 0))
-    pygame.draw.circle(screen, (255, 255, 255), (x, y), 10)
-    pygame.display.flip()
-    clock.tick(60)
-    frames += 1
-
-pygame.quit()
+        if max_frames is not None and frames >= max_frames:
+            running = False
+        if fps:
+            clock.tick(fps)
+
+    profiler.sim_steps = steps
+    return profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Explore the immersive creative room.")
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default="dirty", help="Frame presentation strategy.")
+    parser.add_argument("--width", type=int, default=WIDTH, help="Room width in pixels.")
+    parser.add_argument("--height", type=int, default=HEIGHT, help="Room height in pixels.")
+    parser.add_argument("--sprites", type=int, default=0, help="Extra wandering sprites.")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Simulated seconds before auto-exit.")
+    parser.add_argument("--frames", type=int, help="Also stop after this many rendered frames.")
+    parser.add_argument("--fps", type=int, default=60, help="Render frame cap; 0 runs uncapped.")
+    parser.add_argument("--profile", default="room_profile.json", help="Where to write frame-time percentiles.")
+    parser.add_argument("--background-cache", help="Directory for prebuilt background pixels.")
+    parser.add_argument("--background-cache-mb", type=int, default=BACKGROUND_CACHE_BYTES >> 20,
+                        help="Size cap for --background-cache; least recently used entries go first.")
+    parser.add_argument("--cards", default=CARDS_PATH, help="cards.json whose freq values score the room.")
+    parser.add_argument("--portals", help="cards.json or octagram_nodes_full.json to place as portals.")
+    parser.add_argument("--world", help="Scrolling tiled world size as WxH (e.g. 20000x20000).")
+    parser.add_argument("--floor", choices=("procedural", "art"), default="procedural",
+                        help="Tile source for --world: generated flagstones or assets/img art.")
+    args = parser.parse_args(argv)
+
+    # Initialize pygame modules and audio
+    pygame.init()
+    width, height = args.width, args.height
+    world_w, world_h = map(int, args.world.lower().split("x")) if args.world else (width, height)
+    music = start_music(args.cards, world_w, world_h)
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("Immersive Creative Room")
+
+    if args.world:
+        source = ProceduralTiles()
+        if args.floor == "art" and os.path.exists(CATALOG_PATH):
+            source = ArtTiles(catalog_images(CATALOG_PATH), fallback=source)
+        renderer = TiledRenderer(screen, source, world_w, world_h)
+    else:
+        background = make_background(width, height, cache_dir=args.background_cache,
+                                     max_bytes=args.background_cache_mb << 20)
+        renderer = RENDERERS[args.renderer](screen, background)
+
+    # Avatar starting position
+    avatar = Sprite(world_w // 2, world_h // 2)
+    sprites = make_sprites(args.sprites, world_w, world_h)
+
+    # Main exploration loop (auto-exits after ~2 seconds by default)
+    hooks = [music] if music else []
+    if args.portals:
+        records, key = load_portal_records(args.portals)
+        world = RoomWorld.from_records(records, world_w, world_h, key=key)
+
+        def show_portal(portal):
+            title = portal.data.get("name", portal.id) if portal else None
+            pygame.display.set_caption(f"Immersive Creative Room - {title}" if title else "Immersive Creative Room")
+
+        hooks.append(portal_hook(world, PORTAL_RADIUS, show_portal))
+    profiler = run_loop(renderer, avatar, sprites, world_w, world_h, args.seconds, args.frames, args.fps, hooks=hooks)
+    pygame.quit()
+    if args.profile:
+        profiler.write(args.profile)
+        summary = profiler.summary()
+        print(f"{summary['frames']} frames, p95 {summary.get('frame', {}).get('p95')} ms -> {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import json
+import math
+
+import numpy as np
+
+# Samples per mixed block (~23 ms at 44.1 kHz).
+BLOCK_FRAMES = 1024
+
+
+class WavetableBank:
+    """One pre-rendered, loopable sine table per frequency.
+
+    Each table holds one second of audio with a whole number of cycles, so it
+    loops seamlessly; frequencies are therefore quantized to 1 Hz, which is
+    exact for the card frequencies (432, 528, 963 Hz, ...). Tables are padded
+    with one extra block so any block-sized read is a contiguous slice.
+    """
+
+    def __init__(self, sample_rate=44100, block_frames=BLOCK_FRAMES):
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self._tables = {}
+
+    def table(self, freq):
+        cycles = max(1, int(round(freq)))
+        table = self._tables.get(cycles)
+        if table is None:
+            t = np.arange(self.sample_rate + self.block_frames, dtype=np.float64)
+            table = np.sin(2 * math.pi * cycles * t / self.sample_rate).astype(np.float32)
+            self._tables[cycles] = table
+        return table
+
+
+def load_card_freqs(cards_path):
+    """Card ``freq`` values from a compiled cards.json, in deck order."""
+    with open(cards_path, "r", encoding="utf-8") as f:
+        return [float(card["freq"]) for card in json.load(f) if card.get("freq")]
+
+
+class Voice:
+    __slots__ = ("freq", "table", "pos", "gain", "target", "pending")
+
+    def __init__(self):
+        self.freq, self.table, self.pending = None, None, None
+        self.pos, self.gain, self.target = 0, 0.0, 0.0
+
+
+class CardMixer:
+    """Fixed-voice mixer that crossfades between card tones block by block.
+
+    ``focus(freq)`` fades the matching voice in and every other voice out
+    over ``fade_seconds``; a silent voice is taken from the fixed pool when
+    the frequency is not already sounding. If every voice is still audible
+    the quietest one is marked ``pending``: it finishes fading out and only
+    swaps its wavetable at the block boundary where its gain reaches 0, so
+    a stolen voice never clicks. All buffers
+    are allocated up front, so ``render_block`` does constant work and no
+    allocation however often voices change.
+    """
+
+    def __init__(self, freqs=(), sample_rate=44100, channels=2, block_frames=BLOCK_FRAMES,
+                 max_voices=4, fade_seconds=0.5, volume=0.25):
+        self.bank = WavetableBank(sample_rate, block_frames)
+        for freq in freqs:
+            self.bank.table(freq)  # pre-render so focus() never synthesizes
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self.voices = [Voice() for _ in range(max_voices)]
+        self.fade_step = block_frames / max(1.0, fade_seconds * sample_rate)
+        self.volume = volume
+        self._ramp = np.linspace(0.0, 1.0, block_frames, endpoint=False, dtype=np.float32)
+        self._gain = np.empty(block_frames, dtype=np.float32)
+        self._mix = np.empty(block_frames, dtype=np.float32)
+        self._out = np.empty((block_frames, channels), dtype=np.int16)
+
+    def focus(self, freq):
+        """Crossfade toward ``freq``; ``None`` fades everything out."""
+        voice = None
+        if freq is not None:
+            voice = next((v for v in self.voices if v.pending == freq), None)
+            if voice is None:
+                voice = next((v for v in self.voices if v.freq == freq), None)
+                if voice is not None: voice.pending = None
+            if voice is None:
+                free = [v for v in self.voices if v.gain == 0.0 and v.pending is None]
+                if free:
+                    voice = free[0]
+                    voice.freq, voice.table, voice.pos = freq, self.bank.table(freq), 0
+                else:
+                    voice = min(self.voices, key=lambda v: (v.target, v.gain))
+                    voice.pending = freq
+        for v in self.voices:
+            if v is not voice: v.pending = None
+            v.target = 1.0 if v is voice and v.pending is None else 0.0
+
+    def render_block(self):
+        """Mix the next block; returns an int16 (block_frames, channels) buffer that is reused."""
+        n, mix, gain = self.block_frames, self._mix, self._gain
+        mix.fill(0.0)
+        for v in self.voices:
+            if v.pending is not None and v.gain == 0.0:
+                # Silent now: safe to swap tables and fade the new tone in.
+                v.freq, v.table, v.pos, v.target = v.pending, self.bank.table(v.pending), 0, 1.0
+                v.pending = None
+            if v.table is None or (v.gain == 0.0 and v.target == 0.0):
+                continue
+            if v.gain < v.target:
+                end = min(v.target, v.gain + self.fade_step)
+            else:
+                end = max(v.target, v.gain - self.fade_step)
+            # Linear gain ramp across the block: gain = start + (end - start) * ramp.
+            np.multiply(self._ramp, end - v.gain, out=gain)
+            gain += v.gain
+            gain *= v.table[v.pos:v.pos + n]
+            mix += gain
+            v.gain = end
+            v.pos = (v.pos + n) % self.sample_rate
+        mix *= 32767 * self.volume
+        np.clip(mix, -32767, 32767, out=mix)
+        self._out[:] = mix[:, None]
+        return self._out
+
+
+class MixerOutput:
+    """Streams ``CardMixer`` blocks into pygame through a ring of reused Sounds.
+
+    Each ``pump()`` tops up one mixer channel's play/queue slots, writing
+    straight into the Sound buffers, so at most two blocks are mixed per
+    call and nothing is allocated per frame.
+    """
+
+    def __init__(self, mixer, n_buffers=4):
+        import pygame
+
+        self.mixer = mixer
+        shape = mixer._out.shape if mixer._out.shape[1] > 1 else (mixer.block_frames,)
+        self.sounds = [pygame.sndarray.make_sound(np.zeros(shape, dtype=np.int16)) for _ in range(n_buffers)]
+        self.views = [pygame.sndarray.samples(s) for s in self.sounds]
+        self.channel = pygame.mixer.find_channel(True)
+        self._next = 0
+
+    def _fill(self):
+        i = self._next
+        self._next = (i + 1) % len(self.sounds)
+        block = self.mixer.render_block()
+        self.views[i][...] = block if self.views[i].ndim == 2 else block[:, 0]
+        return self.sounds[i]
+
+    def pump(self):
+        if not self.channel.get_busy():
+            self.channel.play(self._fill())
+        if self.channel.get_queue() is None:
+            self.channel.queue(self._fill())
+
+
+def region_index(x, y, width, height, count):
+    """Index of the grid region (row-major, ~square cells) containing (x, y)."""
+    if count <= 0:
+        return None
+    cols = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / cols)
+    col = min(cols - 1, max(0, int(x * cols // width)))
+    row = min(rows - 1, max(0, int(y * rows // height)))
+    idx = row * cols + col
+    return idx if idx < count else None
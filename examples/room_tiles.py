@@ -0,0 +1,234 @@
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+# Edge length of one world tile in pixels.
+TILE_SIZE = 256
+# Flagstone pitch and mortar width of the procedural cathedral floor.
+STONE = 128
+MORTAR = 3
+FLOOR_PALETTE = np.array(
+    [(58, 44, 72), (66, 50, 84), (52, 40, 66), (74, 58, 92),
+     (60, 48, 78), (70, 52, 80), (48, 38, 60), (80, 64, 98)],
+    dtype=np.uint8,
+)
+MORTAR_COLOR = np.array((24, 18, 32), dtype=np.uint8)
+# Catalog variants tried in order when building floors from the codex art.
+VARIANT_ORDER = ("jpg", "webp", "avif")
+
+
+class ProceduralTiles:
+    """Cathedral flagstones generated per tile from world coordinates.
+
+    Each stone's shade is a hash of its stone coordinates, so any tile can
+    be rebuilt identically in isolation and no floor is ever held whole.
+    """
+
+    def __init__(self, tile_size=TILE_SIZE, seed=0):
+        self.tile_size = tile_size
+        self.seed = seed
+
+    def pixels(self, tx, ty):
+        """(tile_size, tile_size, 3) uint8 array, indexed [x, y] like surfarray."""
+        n = self.tile_size
+        xs = np.arange(tx * n, tx * n + n, dtype=np.int64)
+        ys = np.arange(ty * n, ty * n + n, dtype=np.int64)
+        sx, sy = (xs // STONE)[:, None], (ys // STONE)[None, :]
+        shade = ((sx * 73856093) ^ (sy * 19349663) ^ self.seed) % len(FLOOR_PALETTE)
+        rgb = FLOOR_PALETTE[shade]
+        mortar = ((xs % STONE) < MORTAR)[:, None] | ((ys % STONE) < MORTAR)[None, :]
+        rgb[mortar] = MORTAR_COLOR
+        return rgb
+
+    def tile(self, tx, ty):
+        return pygame.surfarray.make_surface(self.pixels(tx, ty))
+
+
+def catalog_images(catalog_path, root=None):
+    """Best decodable variant path per ASSET_CATALOG entry, in catalog order."""
+    root = root or os.path.dirname(os.path.dirname(os.path.abspath(catalog_path)))
+    with open(catalog_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    paths = []
+    for entry in entries:
+        variants = entry.get("variants", {})
+        for kind in VARIANT_ORDER:
+            found = variants.get(kind)
+            for rel in [found] if isinstance(found, str) else found or []:
+                path = os.path.join(root, rel)
+                if os.path.exists(path) and os.path.getsize(path):
+                    paths.append(path)
+                    break
+            else:
+                continue
+            break
+    return paths
+
+
+class ArtTiles:
+    """Tiles cut from the optimizer's ``assets/img`` variants.
+
+    Each tile shows one artwork (chosen by tile coordinates) scaled to the
+    tile. Decoded, scaled art is kept in a small LRU, so at most
+    ``max_images`` artworks are resident however large the floor. Art that
+    this pygame build cannot decode falls back to ``fallback`` tiles.
+    """
+
+    def __init__(self, paths, tile_size=TILE_SIZE, max_images=8, fallback=None):
+        self.paths = list(paths)
+        self.tile_size = tile_size
+        self.max_images = max_images
+        self.fallback = fallback or ProceduralTiles(tile_size)
+        self._images = OrderedDict()
+
+    def _image(self, path):
+        image = self._images.get(path)
+        if image is None:
+            try:
+                image = pygame.transform.smoothscale(pygame.image.load(path), (self.tile_size, self.tile_size))
+            except pygame.error:
+                image = False
+            self._images[path] = image
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+        else:
+            self._images.move_to_end(path)
+        return image
+
+    def tile(self, tx, ty):
+        if self.paths:
+            image = self._image(self.paths[(tx * 31 + ty * 17) % len(self.paths)])
+            if image:
+                return image.copy()
+        return self.fallback.tile(tx, ty)
+
+
+class TileCache:
+    """Bounded LRU of tile surfaces keyed by ``(tx, ty)``.
+
+    Misses are built by ``source.tile`` on demand; once ``max_tiles`` are
+    resident the least recently used tile is dropped.
+    """
+
+    def __init__(self, source, max_tiles):
+        self.source = source
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def __contains__(self, key):
+        return key in self._tiles
+
+    def get(self, tx, ty):
+        key = (tx, ty)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+        self.misses += 1
+        tile = self._tiles[key] = self.source.tile(tx, ty)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+            self.evictions += 1
+        return tile
+
+    def stats(self):
+        return {"tiles": len(self), "max_tiles": self.max_tiles, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+class Camera:
+    """Viewport onto the world, centred on a target and clamped to the edges."""
+
+    def __init__(self, world_w, world_h, view_w, view_h):
+        self.world_w, self.world_h = world_w, world_h
+        self.view_w, self.view_h = view_w, view_h
+        self.x = self.y = 0
+
+    def follow(self, x, y):
+        self.x = int(min(max(x - self.view_w / 2, 0), max(self.world_w - self.view_w, 0)))
+        self.y = int(min(max(y - self.view_h / 2, 0), max(self.world_h - self.view_h, 0)))
+
+    def tile_range(self, tile_size, margin=0):
+        """Column and row ranges of tiles overlapping the view, grown by ``margin`` tiles."""
+        cols = -(-self.world_w // tile_size)
+        rows = -(-self.world_h // tile_size)
+        c0 = max(self.x // tile_size - margin, 0)
+        r0 = max(self.y // tile_size - margin, 0)
+        c1 = min((self.x + self.view_w - 1) // tile_size + margin, cols - 1)
+        r1 = min((self.y + self.view_h - 1) // tile_size + margin, rows - 1)
+        return range(c0, c1 + 1), range(r0, r1 + 1)
+
+
+def viewport_tiles(view_w, view_h, tile_size=TILE_SIZE, margin=1):
+    """Most tiles a view (plus ``margin`` prefetch ring) can overlap at once."""
+    return (view_w // tile_size + 2 + 2 * margin) * (view_h // tile_size + 2 + 2 * margin)
+
+
+class TiledRenderer:
+    """Scrolling renderer over a tiled world far larger than the screen.
+
+    The camera follows the first sprite (``run_loop`` passes the avatar
+    first); only tiles under the view are blitted. After drawing, up to
+    ``prefetch_per_frame`` tiles from the ring just outside the view on the
+    side the avatar is heading are built ahead of time, so crossing a tile
+    edge does not stall on generation or decode. The cache is sized from the
+    viewport, so memory is flat whatever the world size.
+    """
+
+    def __init__(self, screen, source, world_w, world_h, tile_size=TILE_SIZE, margin=1,
+                 prefetch_per_frame=2, max_tiles=None):
+        self.screen = screen
+        self.tile_size = tile_size
+        self.margin = margin
+        self.prefetch_per_frame = prefetch_per_frame
+        view_w, view_h = screen.get_size()
+        self.camera = Camera(world_w, world_h, view_w, view_h)
+        self.tiles = TileCache(source, max_tiles or viewport_tiles(view_w, view_h, tile_size, margin))
+
+    def draw(self, sprites, alpha=1.0):
+        target = sprites[0]
+        self.camera.follow(target.prev_x + (target.x - target.prev_x) * alpha,
+                           target.prev_y + (target.y - target.prev_y) * alpha)
+        cam, n = self.camera, self.tile_size
+        cols, rows = cam.tile_range(n)
+        for ty in rows:
+            for tx in cols:
+                self.screen.blit(self.tiles.get(tx, ty), (tx * n - cam.x, ty * n - cam.y))
+        offset = (-cam.x, -cam.y)
+        for sprite in sprites:
+            sprite.draw(self.screen, alpha, offset)
+        self.prefetch(target.x - target.prev_x, target.y - target.prev_y)
+        return None
+
+    def prefetch(self, dx, dy):
+        """Build missing tiles in the margin ring on the ``(dx, dy)`` side of the view."""
+        if not (dx or dy) or not self.prefetch_per_frame:
+            return 0
+        cols, rows = self.camera.tile_range(self.tile_size)
+        ring_cols, ring_rows = self.camera.tile_range(self.tile_size, self.margin)
+        ahead = []
+        for ty in ring_rows:
+            for tx in ring_cols:
+                if tx in cols and ty in rows:
+                    continue
+                if (dx > 0 and tx > cols[-1]) or (dx < 0 and tx < cols[0]) \
+                        or (dy > 0 and ty > rows[-1]) or (dy < 0 and ty < rows[0]):
+                    if (tx, ty) not in self.tiles:
+                        ahead.append((tx, ty))
+        for tx, ty in ahead[:self.prefetch_per_frame]:
+            self.tiles.get(tx, ty)
+        return min(len(ahead), self.prefetch_per_frame)
+
+    def present(self, _dirty=None):
+        pygame.display.flip()
+
+    def render(self, sprites, alpha=1.0):
+        self.present(self.draw(sprites, alpha))
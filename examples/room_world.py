@@ -0,0 +1,153 @@
+import json
+import math
+
+
+class Portal:
+    """A card portal: an axis-aligned hitbox tied to a card or lattice node."""
+
+    __slots__ = ("id", "x", "y", "w", "h", "data")
+
+    def __init__(self, id, x, y, w, h, data=None):
+        self.id = id
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.data = data or {}
+
+    @property
+    def center(self):
+        return self.x + self.w / 2, self.y + self.h / 2
+
+    def contains(self, px, py):
+        return self.x <= px < self.x + self.w and self.y <= py < self.y + self.h
+
+    def distance_to(self, px, py):
+        """Distance from a point to the nearest edge of the hitbox (0 inside)."""
+        dx = max(self.x - px, 0, px - (self.x + self.w))
+        dy = max(self.y - py, 0, py - (self.y + self.h))
+        return math.hypot(dx, dy)
+
+    def __repr__(self):
+        return f"Portal({self.id!r}, {self.x}, {self.y}, {self.w}, {self.h})"
+
+
+class SpatialHash:
+    """Uniform-grid index of rectangles.
+
+    Each item is bucketed in every ``cell_size`` cell its rect overlaps, so
+    a query only visits the cells around the query area. With cells sized
+    near the typical query radius, cost depends on local density, not on
+    how many items the room holds.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._where = {}
+
+    def __len__(self):
+        return len(self._where)
+
+    def _span(self, x, y, w, h):
+        cs = self.cell_size
+        return range(int(x // cs), int((x + w) // cs) + 1), range(int(y // cs), int((y + h) // cs) + 1)
+
+    def insert(self, item, x, y, w, h):
+        cols, rows = self._span(x, y, w, h)
+        keys = [(cx, cy) for cx in cols for cy in rows]
+        for key in keys:
+            self._cells.setdefault(key, []).append(item)
+        self._where[id(item)] = keys
+
+    def remove(self, item):
+        for key in self._where.pop(id(item), ()):
+            bucket = self._cells[key]
+            bucket.remove(item)
+            if not bucket:
+                del self._cells[key]
+
+    def candidates(self, x, y, w, h):
+        """Items whose cells overlap the rect; may include non-overlapping items."""
+        seen, out = set(), []
+        cols, rows = self._span(x, y, w, h)
+        cells = self._cells
+        for cx in cols:
+            for cy in rows:
+                for item in cells.get((cx, cy), ()):
+                    if id(item) not in seen:
+                        seen.add(id(item))
+                        out.append(item)
+        return out
+
+
+class RoomWorld:
+    """Portals of one room plus the spatial index used to hit-test them."""
+
+    def __init__(self, width, height, cell_size=64):
+        self.width, self.height = width, height
+        self.portals = {}
+        self.index = SpatialHash(cell_size)
+
+    def add(self, portal):
+        if portal.id in self.portals:
+            self.index.remove(self.portals[portal.id])
+        self.portals[portal.id] = portal
+        self.index.insert(portal, portal.x, portal.y, portal.w, portal.h)
+        return portal
+
+    def remove(self, portal_id):
+        self.index.remove(self.portals.pop(portal_id))
+
+    def hit(self, px, py):
+        """Portals whose hitbox contains the point."""
+        return [p for p in self.index.candidates(px, py, 0, 0) if p.contains(px, py)]
+
+    def near(self, px, py, radius):
+        """Portals within ``radius`` of the point, nearest first."""
+        found = []
+        for p in self.index.candidates(px - radius, py - radius, 2 * radius, 2 * radius):
+            d = p.distance_to(px, py)
+            if d <= radius:
+                found.append((d, p))
+        found.sort(key=lambda dp: dp[0])
+        return [p for _, p in found]
+
+    def nearest(self, px, py, radius):
+        found = self.near(px, py, radius)
+        return found[0] if found else None
+
+    @classmethod
+    def from_records(cls, records, width, height, key="id", portal_size=48, cell_size=64):
+        """Lay records out on a centred grid of portals, one per record."""
+        world = cls(width, height, cell_size)
+        n = len(records)
+        if not n:
+            return world
+        cols = math.ceil(math.sqrt(n * width / height))
+        rows = math.ceil(n / cols)
+        sx, sy = width / cols, height / rows
+        for i, rec in enumerate(records):
+            col, row = i % cols, i // cols
+            x = col * sx + (sx - portal_size) / 2
+            y = row * sy + (sy - portal_size) / 2
+            world.add(Portal(rec.get(key, i), x, y, portal_size, portal_size, rec))
+        return world
+
+
+def load_portal_records(path):
+    """Portal records from cards.json (keyed by ``id``) or octagram nodes (keyed by ``tarot``)."""
+    with open(path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    key = "id" if records and "id" in records[0] else "tarot"
+    return records, key
+
+
+def portal_hook(world, radius, on_change):
+    """Per-frame hook for ``run_loop``: calls ``on_change(portal or None)`` when the nearest portal changes."""
+    current = [object()]
+
+    def hook(avatar):
+        portal = world.nearest(avatar.x, avatar.y, radius)
+        if portal is not current[0]:
+            current[0] = portal
+            on_change(portal)
+
+    return hook
@@ -0,0 +1,103 @@
+import argparse
+import json
+import math
+import wave
+
+import numpy as np
+
+# Frames per streamed block; ~8 KB of int16 mono, so memory stays flat for
+# hour-long beds no matter how many segments are sequenced.
+BLOCK_FRAMES = 4096
+
+
+def tone_blocks(segments, sample_rate=44100, channels=1, block_frames=BLOCK_FRAMES, amplitude=32767):
+    """Yield int16 blocks of shape (block_frames, channels) for a tone sequence.
+
+    ``segments`` is an iterable of ``(freq, seconds)`` pairs; ``freq`` may be
+    one frequency or one per channel. Phase is carried across blocks and
+    across frequency changes, so segment joins are click-free. The last
+    block may be shorter.
+    """
+    phase = np.zeros(channels, dtype=np.float64)
+    ramp = np.arange(block_frames, dtype=np.float64)
+    scratch = np.empty(block_frames, dtype=np.float64)
+    block = np.empty((block_frames, channels), dtype=np.int16)
+    filled = 0
+    for freq, seconds in segments:
+        step = 2 * math.pi * np.broadcast_to(np.asarray(freq, dtype=np.float64), (channels,)) / sample_rate
+        remaining = int(sample_rate * seconds)
+        while remaining:
+            n = min(remaining, block_frames - filled)
+            for ch in range(channels):
+                tmp = scratch[:n]
+                np.multiply(ramp[:n], step[ch], out=tmp)
+                tmp += phase[ch]
+                np.sin(tmp, out=tmp)
+                tmp *= amplitude
+                block[filled:filled + n, ch] = tmp
+            phase = (phase + step * n) % (2 * math.pi)
+            filled += n
+            remaining -= n
+            if filled == block_frames:
+                yield block.copy()
+                filled = 0
+    if filled:
+        yield block[:filled].copy()
+
+
+def segment_frames(segments, sample_rate=44100):
+    """Total frames ``tone_blocks`` will produce for ``segments``."""
+    return sum(int(sample_rate * seconds) for _, seconds in segments)
+
+
+def stream_wav(target, blocks, sample_rate=44100, channels=1, n_frames=None):
+    """Stream int16 blocks into a WAV file path or binary file-like sink.
+
+    Each block is written as it arrives. Pass ``n_frames`` when the sink is
+    not seekable so the header can be written up front. Returns frames written.
+    """
+    written = 0
+    with wave.open(target, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        if n_frames is not None:
+            wav_file.setnframes(n_frames)
+        for block in blocks:
+            wav_file.writeframesraw(np.ascontiguousarray(block, dtype="<i2").tobytes())
+            written += len(block)
+    return written
+
+
+def card_segments(cards_path="assets/data/cards.json", seconds_per_card=60.0, loops=1):
+    """Yield ``(freq, seconds)`` per card ``freq`` in deck order, ``loops`` times."""
+    with open(cards_path, "r", encoding="utf-8") as f:
+        freqs = [float(card["freq"]) for card in json.load(f) if card.get("freq")]
+    for _ in range(loops):
+        for freq in freqs:
+            yield freq, seconds_per_card
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a long ambient bed keyed to card frequencies.")
+    parser.add_argument("out", help="WAV file to write.")
+    parser.add_argument("--cards", default="assets/data/cards.json", help="Card registry supplying freq values.")
+    parser.add_argument("--seconds-per-card", type=float, default=60.0, help="Duration of each card's tone.")
+    parser.add_argument("--loops", type=int, default=1, help="Times to cycle through the deck.")
+    parser.add_argument("--sample-rate", type=int, default=44100, help="Audio sample rate in Hz.")
+    parser.add_argument("--channels", type=int, choices=(1, 2), default=1, help="Mono or stereo audio.")
+    args = parser.parse_args(argv)
+
+    segments = list(card_segments(args.cards, args.seconds_per_card, args.loops))
+    frames = stream_wav(
+        args.out,
+        tone_blocks(segments, args.sample_rate, args.channels),
+        args.sample_rate,
+        args.channels,
+        n_frames=segment_frames(segments, args.sample_rate),
+    )
+    print(f"Wrote {frames / args.sample_rate:.1f}s across {len(segments)} tone(s) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
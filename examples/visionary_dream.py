@@ -1,105 +1,412 @@
 import argparse
+import hashlib
+import json
 import math
+import os
 import random
-from datetime import datetime
-import struct
+import time
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 import wave
 
+import numpy as np
 from PIL import Image, ImageDraw
 
+# Samples per vectorized block. Only the first block calls sin/cos; later
+# blocks rotate it by their start phase, so cost is a few multiply-adds per
+# sample and scratch memory stays at ~24 MB regardless of duration.
+SYNTH_CHUNK = 1 << 20
 
-def generate_tone(filename, duration=2.0, freq=440.0, sample_rate=44100):
-    """Create a simple sine-wave tone and save it as a WAV file."""
+
+def synthesize(duration=2.0, freq=440.0, sample_rate=44100, channels=1, amplitude=32767):
+    """Return an interleaved int16 sine buffer of shape (n_samples, channels).
+
+    ``freq`` may be a single frequency shared by every channel or one
+    frequency per channel (e.g. ``(220, 224)`` for a binaural stereo bed).
+    """
+    if sample_rate <= 0 or channels <= 0:
+        raise ValueError("sample_rate and channels must be positive")
+    freqs = np.broadcast_to(np.asarray(freq, dtype=np.float64), (channels,))
     n_samples = int(sample_rate * duration)
-    amplitude = 32767
+    out = np.empty((n_samples, channels), dtype=np.int16)
+    block = max(1, min(SYNTH_CHUNK, n_samples))
+    base = np.arange(block, dtype=np.float64)
+    scratch = np.empty(block, dtype=np.float64)
+    for ch, f in enumerate(freqs):
+        step = 2 * math.pi * f / sample_rate
+        sin_b = np.sin(base * step) * amplitude
+        cos_b = np.cos(base * step) * amplitude
+        for start in range(0, n_samples, block):
+            n = min(block, n_samples - start)
+            # sin(a + phi) = sin(a)cos(phi) + cos(a)sin(phi); phi is exact per block.
+            phi = (step * start) % (2 * math.pi)
+            tmp = scratch[:n]
+            np.multiply(sin_b[:n], math.cos(phi), out=tmp)
+            tmp += cos_b[:n] * math.sin(phi)
+            out[start:start + n, ch] = tmp  # truncates toward zero, like int()
+    return out
+
+
+def write_wav(filename, samples, sample_rate=44100):
+    """Write an int16 (n_samples, channels) buffer with one bulk frame write."""
+    samples = np.ascontiguousarray(samples, dtype="<i2")
+    if samples.ndim == 1:
+        samples = samples[:, None]
     with wave.open(filename, "w") as wav_file:
-        wav_file.setparams((1, 2, sample_rate, n_samples, "NONE", "not compressed"))
-        for i in range(n_samples):
-            value = int(amplitude * math.sin(2 * math.pi * freq * i / sample_rate))
-            wav_file.writeframes(struct.pack("<h", value))
+        wav_file.setnchannels(samples.shape[1])
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
 
 
-def create_visionary_room(room_name: str, width: int = 1920, height: int = 1080) -> None:
-    """Generate an immersive visionary art room and matching audio."""
-    # Create base image with black background
-    canvas = Image.new("RGB", (width, height), "black")
-    draw = ImageDraw.Draw(canvas)
+def generate_tone(filename, duration=2.0, freq=440.0, sample_rate=44100, channels=1):
+    """Create a sine-wave tone and save it as a WAV file."""
+    write_wav(filename, synthesize(duration, freq, sample_rate, channels), sample_rate)
+
+
+# Define a vibrant, Alex Grey-inspired color palette
+PALETTE = [
+    (72, 61, 139),   # DarkSlateBlue
+    (138, 43, 226),  # BlueViolet
+    (255, 140, 0),   # DarkOrange
+    (0, 206, 209),   # DarkTurquoise
+    (255, 20, 147)   # DeepPink
+]
+
+# Rows rasterized per step by the NumPy backend; keeps float scratch to a
+# few tens of MB even at 8K instead of full-frame grids.
+RASTER_BAND = 256
 
-    # Define a vibrant, Alex Grey-inspired color palette
-    palette = [
-        (72, 61, 139),   # DarkSlateBlue
-        (138, 43, 226),  # BlueViolet
-        (255, 140, 0),   # DarkOrange
-        (0, 206, 209),   # DarkTurquoise
-        (255, 20, 147)   # DeepPink
-    ]
 
-    # Draw concentric radial patterns
+def room_layout(width: int, height: int, rng: random.Random, palette=PALETTE) -> dict:
+    """Pick every primitive of a room; both render backends draw this layout."""
+    palette = [tuple(c) for c in palette]
     center = (width // 2, height // 2)
     max_radius = int(math.hypot(width, height) / 2)
-    for radius in range(20, max_radius, 15):
-        color = random.choice(palette)
-        bbox = [
-            center[0] - radius,
-            center[1] - radius,
-            center[0] + radius,
-            center[1] + radius
-        ]
-        draw.ellipse(bbox, outline=color, width=2)
-
-    # Generate symmetrical arc patterns
+    # Concentric radial patterns
+    rings = [(radius, rng.choice(palette)) for radius in range(20, max_radius, 15)]
+    # Symmetrical arc patterns
+    spokes = []
     for i in range(60):
-        color = palette[i % len(palette)]
         angle = i * (math.pi / 30)
         x = center[0] + int(math.cos(angle) * max_radius)
         y = center[1] + int(math.sin(angle) * max_radius)
-        draw.line([center, (x, y)], fill=color, width=2)
-
-    # Add random luminescent points
+        spokes.append(((x, y), palette[i % len(palette)]))
+    # Random luminescent points
+    dots = []
     for _ in range(300):
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        color = random.choice(palette)
+        x = rng.randint(0, width - 1)
+        y = rng.randint(0, height - 1)
+        dots.append((x, y, rng.choice(palette)))
+    return {"center": center, "max_radius": max_radius, "rings": rings, "spokes": spokes, "dots": dots}
+
+
+def render_room_pil(layout: dict, width: int, height: int) -> Image.Image:
+    """Draw the layout primitive by primitive with ImageDraw."""
+    # Create base image with black background
+    canvas = Image.new("RGB", (width, height), "black")
+    draw = ImageDraw.Draw(canvas)
+    cx, cy = layout["center"]
+    for radius, color in layout["rings"]:
+        draw.ellipse([cx - radius, cy - radius, cx + radius, cy + radius], outline=color, width=2)
+    for end, color in layout["spokes"]:
+        draw.line([layout["center"], end], fill=color, width=2)
+    for x, y, color in layout["dots"]:
         draw.ellipse([x, y, x + 3, y + 3], fill=color)
+    return canvas
 
-    # Timestamped filenames prevent overwriting
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    image_name = f"Visionary_Dream_{room_name}_{timestamp}.png"
-    audio_name = f"Visionary_Audio_{room_name}_{timestamp}.wav"
 
-    # Save the final visionary artifacts
-    canvas.save(image_name)
-    generate_tone(audio_name, freq=220 + random.randint(0, 220))
+def render_room_numpy(layout: dict, width: int, height: int) -> Image.Image:
+    """Rasterize the layout as bulk array operations.
 
-    print(f"Created room {room_name}: {image_name} & {audio_name}")
+    Rings come from a per-pixel distance field evaluated in bands of rows;
+    spokes are sampled along their angles and dots stamped for every point
+    at once, so cost scales with pixel count rather than primitive count.
+    Everything is drawn as uint8 palette indices and expanded to RGB once.
+    """
+    cx, cy = layout["center"]
+    colors = [(0, 0, 0)] + sorted({c for _, c in layout["rings"] + layout["spokes"]} | {d[2] for d in layout["dots"]})
+    lut = {c: i for i, c in enumerate(colors)}
+    idx = np.zeros((height, width), dtype=np.uint8)
+    if layout["rings"]:
+        # Rings are symmetric about the center: rasterize one quadrant of
+        # |dx|, |dy| and mirror it into the other three.
+        ring_idx = np.array([lut[c] for _, c in layout["rings"]] + [0], dtype=np.uint8)
+        n_rings = len(layout["rings"])
+        qh, qw = max(cy, height - 1 - cy) + 1, max(cx, width - 1 - cx) + 1
+        quad = np.empty((qh, qw), dtype=np.uint8)
+        dx2 = np.square(np.arange(qw, dtype=np.float32))
+        for top in range(0, qh, RASTER_BAND):
+            rows = min(RASTER_BAND, qh - top)
+            dy2 = np.square(np.arange(top, top + rows, dtype=np.float32))
+            dist = np.sqrt(dx2[None, :] + dy2[:, None])
+            # A width-2 PIL outline of radius r covers about r - 1.5 <= d <= r + 0.4.
+            k = np.ceil((dist - 20.4) * (1 / 15))
+            miss = (20 + 15 * k - dist > 1.5) | (k < 0) | (k >= n_rings)
+            k[miss] = n_rings
+            quad[top:top + rows] = ring_idx[k.astype(np.intp)]
+        below, right = height - cy, width - cx
+        idx[cy:, cx:] = quad[:below, :right]
+        idx[cy:, :cx] = quad[:below, cx:0:-1]
+        idx[:cy, cx:] = quad[cy:0:-1, :right]
+        idx[:cy, :cx] = quad[cy:0:-1, cx:0:-1]
+    if layout["spokes"]:
+        # Half-pixel steps along each spoke; like ImageDraw's width-2 lines the
+        # second pixel is offset across the major axis, toward its direction.
+        ends = np.array([end for end, _ in layout["spokes"]], dtype=np.float32)
+        vec = ends - np.array([cx, cy], dtype=np.float32)
+        length = np.hypot(vec[:, 0], vec[:, 1])[:, None]
+        t = np.arange(0, float(length.max()) + 0.5, 0.5, dtype=np.float32)[None, :]
+        base_x = np.rint(cx + vec[:, :1] / length * t).astype(np.intp)
+        base_y = np.rint(cy + vec[:, 1:] / length * t).astype(np.intp)
+        steep = np.abs(vec[:, 1]) > np.abs(vec[:, 0])
+        off_x = np.where(steep, np.sign(vec[:, 1]), 0).astype(np.intp)[:, None]
+        off_y = np.where(steep, 0, np.sign(vec[:, 0])).astype(np.intp)[:, None]
+        spoke_idx = np.repeat(np.array([lut[c] for _, c in layout["spokes"]], dtype=np.uint8), t.size)
+        keep_t = np.broadcast_to(t <= length, base_x.shape).ravel()
+        for px, py in ((base_x, base_y), (base_x + off_x, base_y + off_y)):
+            px, py = px.ravel(), py.ravel()
+            ok = keep_t & (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            idx[py[ok], px[ok]] = spoke_idx[ok]
+    if layout["dots"]:
+        # 4x4 discs with clipped corners, matching ImageDraw.ellipse([x, y, x+3, y+3]).
+        # Indices are laid out dot-major so later dots overwrite earlier ones.
+        xs, ys, dot_colors = zip(*layout["dots"])
+        disc = np.array([(ox, oy) for oy in range(4) for ox in range(4) if (ox in (0, 3)) + (oy in (0, 3)) < 2])
+        px = (np.array(xs)[:, None] + disc[:, 0]).ravel()
+        py = (np.array(ys)[:, None] + disc[:, 1]).ravel()
+        dot_idx = np.repeat(np.array([lut[c] for c in dot_colors], dtype=np.uint8), len(disc))
+        ok = (px < width) & (py < height)
+        idx[py[ok], px[ok]] = dot_idx[ok]
+    canvas = Image.fromarray(idx, "P")
+    canvas.putpalette([v for c in colors for v in c])
+    return canvas.convert("RGB")
 
 
-if __name__ == "__main__":
+RENDER_BACKENDS = {"pil": render_room_pil, "numpy": render_room_numpy}
+
+
+# Bump when rendering or synthesis changes so stale cache entries miss.
+CACHE_VERSION = 1
+
+
+def room_key(**params) -> str:
+    """Content address of a room: hash of every parameter that shapes its output."""
+    blob = json.dumps(dict(params, version=CACHE_VERSION), sort_keys=True, default=list)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class RoomCache:
+    """Size-capped, content-addressed store of rendered PNG/WAV pairs.
+
+    Entries are ``<key>.png`` / ``<key>.wav`` under ``root``; file mtimes act
+    as the LRU clock (refreshed on every hit) and the least recently used
+    pairs are evicted once the directory exceeds ``max_bytes``. Writes go
+    through a temp file and ``os.replace`` so concurrent workers never see
+    partial entries.
+    """
+
+    SUFFIXES = (".png", ".wav")
+
+    def __init__(self, root: str, max_bytes: int = 1 << 30):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def _paths(self, key: str):
+        return [os.path.join(self.root, key + suffix) for suffix in self.SUFFIXES]
+
+    def fetch(self, key: str, *targets: str) -> bool:
+        """Materialize a cached entry at ``targets``; False on a miss."""
+        paths = self._paths(key)
+        try:
+            for src in paths:
+                os.utime(src)
+            for src, dst in zip(paths, targets):
+                _place(src, dst)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key: str, *sources: str) -> None:
+        for src, dst in zip(sources, self._paths(key)):
+            tmp = f"{dst}.{os.getpid()}.tmp"
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dst)
+        self.evict()
+
+    def evict(self) -> None:
+        entries, total = {}, 0
+        with os.scandir(self.root) as it:
+            for e in it:
+                key, suffix = os.path.splitext(e.name)
+                if suffix not in self.SUFFIXES:
+                    continue
+                try:
+                    st = e.stat()
+                except FileNotFoundError:
+                    continue
+                size, mtime = entries.get(key, (0, 0))
+                entries[key] = (size + st.st_size, max(mtime, st.st_mtime))
+                total += st.st_size
+        for key, (size, _) in sorted(entries.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+
+def _place(src: str, dst: str) -> None:
+    """Hard-link ``src`` to ``dst`` when possible, else copy it."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def create_visionary_room(
+    room_name: str,
+    width: int = 1920,
+    height: int = 1080,
+    audio_duration: float = 2.0,
+    sample_rate: int = 44100,
+    channels: int = 1,
+    seed: int | None = None,
+    out_dir: str = ".",
+    backend: str = "pil",
+    palette=PALETTE,
+    cache_dir: str | None = None,
+    cache_max_bytes: int = 1 << 30,
+) -> dict:
+    """Generate an immersive visionary art room and matching audio.
+
+    All randomness comes from a ``random.Random(seed)`` so a given seed always
+    yields the same art and tone, whichever ``backend`` ("pil" or "numpy")
+    rasterizes it; without a seed a fresh one is drawn and recorded. Files
+    are named by a content hash of the room parameters, and with
+    ``cache_dir`` a repeat request is served from a :class:`RoomCache`
+    instead of being rendered again. Returns the room's manifest entry.
+    """
+    started = time.perf_counter()
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**63)
+    palette = [tuple(c) for c in palette]
+    rng = random.Random(seed)
+    layout = room_layout(width, height, rng, palette)
+    freq = 220 + rng.randint(0, 220)
+
+    key = room_key(
+        width=width, height=height, seed=seed, palette=palette, backend=backend,
+        audio_duration=audio_duration, sample_rate=sample_rate, channels=channels,
+    )
+    # Content-addressed filenames: same request, same name; new content never overwrites.
+    image_name = os.path.join(out_dir, f"Visionary_Dream_{room_name}_{key[:12]}.png")
+    audio_name = os.path.join(out_dir, f"Visionary_Audio_{room_name}_{key[:12]}.wav")
+
+    cache = RoomCache(cache_dir, cache_max_bytes) if cache_dir else None
+    cached = cache is not None and cache.fetch(key, image_name, audio_name)
+    if not cached:
+        # Save the final visionary artifacts
+        RENDER_BACKENDS[backend](layout, width, height).save(image_name)
+        generate_tone(
+            audio_name,
+            duration=audio_duration,
+            freq=freq,
+            sample_rate=sample_rate,
+            channels=channels,
+        )
+        if cache is not None:
+            cache.store(key, image_name, audio_name)
+
+    print(f"Created room {room_name}: {image_name} & {audio_name}{' (cached)' if cached else ''}")
+    return {
+        "room": room_name,
+        "seed": seed,
+        "key": key,
+        "image": image_name,
+        "audio": audio_name,
+        "freq": freq,
+        "cached": cached,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def room_seed(base_seed: int, room_name: str) -> int:
+    """Derive a stable per-room seed, independent of how rooms are scheduled."""
+    digest = hashlib.sha256(f"{base_seed}:{room_name}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _render_room(job: dict) -> dict:
+    return create_visionary_room(**job)
+
+
+def generate_rooms(count: int, workers: int = 1, base_seed: int = 0, **room_kwargs) -> dict:
+    """Render ``count`` rooms, spreading them over ``workers`` processes.
+
+    Returns a manifest with the base seed, per-room entries (in room order)
+    and the wall-clock time of the whole batch.
+    """
+    started = time.perf_counter()
+    jobs = [
+        dict(room_kwargs, room_name=f"room{i}", seed=room_seed(base_seed, f"room{i}"))
+        for i in range(1, count + 1)
+    ]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rooms = list(pool.map(_render_room, jobs))
+    else:
+        rooms = [_render_room(job) for job in jobs]
+    return {
+        "base_seed": base_seed,
+        "workers": workers,
+        "rooms": rooms,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Generate immersive visionary art rooms.")
     parser.add_argument("--rooms", type=int, default=1, help="Number of rooms to create.")
-    args = parser.parse_args()
-
-    for i in range(1, args.rooms + 1):
-        create_visionary_room(f"room{i}")
-
-    draw.ellipse(bbox, outline=color, width=2)
-
-# Generate symmetrical arc patterns
-for i in range(60):
-    color = palette[i % len(palette)]
-    angle = i * (math.pi / 30)
-    x = center[0] + int(math.cos(angle) * max_radius)
-    y = center[1] + int(math.sin(angle) * max_radius)
-    draw.line([center, (x, y)], fill=color, width=2)
-
-# Add random luminescent points
-for _ in range(300):
-    x = random.randint(0, WIDTH - 1)
-    y = random.randint(0, HEIGHT - 1)
-    color = random.choice(palette)
-    draw.ellipse([x, y, x + 3, y + 3], fill=color)
-
-# Save the final visionary art piece with a unique timestamped name
-filename = f"Visionary_Dream_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-canvas.save(filename)
-print(f"Saved {filename}")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to render rooms.")
+    parser.add_argument("--seed", type=int, help="Base seed; omit for a fresh random one.")
+    parser.add_argument("--manifest", default="visionary_manifest.json", help="Where to write the run manifest.")
+    parser.add_argument("--audio-seconds", type=float, default=2.0, help="Length of each room's tone.")
+    parser.add_argument("--sample-rate", type=int, default=44100, help="Audio sample rate in Hz.")
+    parser.add_argument("--channels", type=int, choices=(1, 2), default=1, help="Mono or stereo audio.")
+    parser.add_argument("--backend", choices=sorted(RENDER_BACKENDS), default="pil", help="Image rasterizer.")
+    parser.add_argument("--width", type=int, default=1920, help="Room image width.")
+    parser.add_argument("--height", type=int, default=1080, help="Room image height.")
+    parser.add_argument("--cache-dir", help="Reuse rendered rooms from this content-addressed cache.")
+    parser.add_argument("--cache-max-mb", type=int, default=1024, help="Cache size cap before LRU eviction.")
+    args = parser.parse_args(argv)
+
+    base_seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2**32)
+    manifest = generate_rooms(
+        args.rooms,
+        workers=max(1, args.workers),
+        base_seed=base_seed,
+        audio_duration=args.audio_seconds,
+        sample_rate=args.sample_rate,
+        channels=args.channels,
+        backend=args.backend,
+        width=args.width,
+        height=args.height,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=args.cache_max_mb << 20,
+    )
+    with open(args.manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Rendered {len(manifest['rooms'])} room(s) in {manifest['seconds']}s -> {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,4 +15,12 @@ if os.path.exists(_csv_misnamed):
             if "test_labels_csv.py" not in collect_ignore:
                 collect_ignore.append("test_labels_csv.py")
     except OSError as _err:
-        logging.debug("Unable to read %s: %s", _csv_misnamed, _err)
\ No newline at end of file
+        logging.debug("Unable to read %s: %s", _csv_misnamed, _err)
+# Python tooling lives in plain script folders (tools/, examples/); expose them
+# so tests can import e.g. `registry_compile` directly.
+import sys
+
+for _sub in ("tools", "examples"):
+    _p = os.path.join(os.path.dirname(_this_dir), _sub)
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
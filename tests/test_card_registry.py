@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the cross-registry join in tools/card_registry.py.
+
+import json
+
+import card_registry as cr
+
+
+def test_repo_sources_join_on_every_key():
+    reg = cr.CardRegistry.load()
+    assert len([v for v in reg if v["id"][:2] == "MA"]) == 22 and len(reg.by_suit("cups")) == 14
+    assert len(reg) == 78 and len(reg.by_suit("majors")) == 22
+    assert all(reg.get(c["id"]) is None for c in reg.unmatched)
+    star = reg.get("MA17")
+    for key in ("wisdom_stream", "The Star", "star", "Tzaddi", "צ", "17"):
+        assert reg.get(key) is star
+    assert star["crosswalk"]["planet"] == "Aquarius" and star["node"]["tarot"] == "The Star"
+    # Node titles differ from the codex ("The Tower / Aeon", "High Priestess").
+    assert reg.get("MA16")["node"]["letter"] == "Pe" and reg.get("MA02")["node"] is not None
+    assert reg.get("w1")["title"] == "Ace of Wands" and reg.get("nope") is None
+
+
+def test_compiled_cards_join_by_slug_title_or_letter(tmp_path):
+    codex = {"canonical": {"major": [["MA00", "The Fool", "Rebecca", "Aleph", "initiate_zero"],
+                                     ["MA01", "The Magician", "Virelai", "Beth", "octarine_witch"]],
+                           "minor": {"W": [["W01", "Ace of Wands", "Spark"]]}},
+             "compat": {"legacy_to_canonical": {"0": "MA00", "w1": "W01"}}}
+    cards = [{"id": "initiate_zero", "name": "Fool"}, {"id": "mage", "name": "Mage", "letter": "ב"},
+             {"id": "extra", "name": "Extra", "suit": "majors"}]
+    for name, data in (("codex", codex), ("cards", cards)):
+        path = tmp_path / cr.SOURCES[name]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    reg = cr.CardRegistry.load(str(tmp_path))  # crosswalk and nodes missing: joined as empty
+    assert reg.get("0")["card"]["id"] == "initiate_zero"
+    assert reg.get("mage")["id"] == "MA01" and reg.get("Beth")["card"]["id"] == "mage"
+    # A compiled card matching no codex card stays out of the canonical views.
+    assert reg.get("extra") is None and reg.get("The Extra") is None and reg.unmatched == [cards[2]]
+    assert reg.get("W01")["crosswalk"] is None and len(reg) == 3 and len(reg.by_suit("majors")) == 2
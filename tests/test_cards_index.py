@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the indexed binary card registry written by tools/cards_index.py.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cards_index import CardIndex, build_index
+from bench_cards_index import synth_deck
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def deck():
+    return synth_deck(500)
+
+
+@pytest.fixture(scope="module")
+def index(deck):
+    return CardIndex(build_index(deck))
+
+
+def test_get_round_trips_every_card(deck, index):
+    assert len(index) == len(deck)
+    for card in deck[::37]:
+        assert index.get(card["id"]) == card
+    assert index.get("missing") is None and "missing" not in index
+
+
+@pytest.mark.parametrize("suit,q", [("all", ""), ("cups", ""), ("all", "ka"), ("swords", "mel"),
+                                    ("all", "OF LUM"), ("wands", "zzz"), ("nope", "")])
+def test_query_matches_linear_filter(deck, index, suit, q):
+    expected = [c["id"] for c in deck
+                if (suit == "all" or c["suit"] == suit) and q.lower() in c["name"].lower()]
+    assert index.query_ids(suit, q) == expected
+    assert [c["id"] for c in index.query(suit, q, limit=5)] == expected[:5]
+
+
+def test_by_frequency_sorted(index):
+    freqs = [c["freq"] for c in index.by_frequency()]
+    assert freqs == sorted(freqs)
+
+
+def test_irregular_cards_and_version_check():
+    cards = [{"id": "a", "name": "Ace", "suit": "cups", "freq": 1.0},
+             {"id": "b", "name": "Bee", "suit": "cups", "freq": 2.0, "source": "x.md"}]
+    blob = build_index(cards)
+    assert CardIndex(blob).get("b") == cards[1]
+    with pytest.raises(ValueError):
+        CardIndex(blob[:4] + b"\x09\x00" + blob[6:])
+
+
+def test_committed_index_matches_cards_json():
+    cards = json.loads((ROOT / "assets/data/cards.json").read_text(encoding="utf-8"))
+    idx = CardIndex.open(ROOT / "assets/data/cards.idx")
+    assert [idx.get(c["id"]) for c in cards] == cards
+
+
+def test_index_smaller_than_minified_json():
+    cards = synth_deck(2000)
+    minified = json.dumps(cards, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert len(build_index(cards)) < len(minified)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the headless renderers in examples/immersive_room.py.
+
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+np = pytest.importorskip("numpy")
+
+import immersive_room as room
+
+
+@pytest.fixture
+def screen():
+    pygame.display.init()
+    yield pygame.display.set_mode((160, 120))
+    pygame.display.quit()
+
+
+def _run(renderer_cls, screen, frames=25):
+    background = room.make_background(160, 120)
+    renderer = renderer_cls(screen, background)
+    sprites = [room.Sprite(80, 60)] + room.make_sprites(8, 160, 120, seed=3)
+    for _ in range(frames):
+        sprites[0].x += 2
+        for sprite in sprites[1:]:
+            sprite.step(160, 120)
+        renderer.render(sprites)
+    return pygame.surfarray.array3d(screen)
+
+
+def test_dirty_rects_match_full_redraw(screen):
+    full = _run(room.FullRenderer, screen)
+    dirty = _run(room.DirtyRectRenderer, screen)
+    assert np.array_equal(full, dirty)
+
+
+def test_dirty_renderer_updates_only_sprite_rects(screen, monkeypatch):
+    updates = []
+    monkeypatch.setattr(pygame.display, "update", lambda rects: updates.append(list(rects)))
+    renderer = room.DirtyRectRenderer(screen, room.make_background(160, 120))
+    sprite = room.Sprite(40, 40)
+    renderer.render([sprite])
+    sprite.x += 5
+    renderer.render([sprite])
+    (rect,) = updates[-1]
+    assert rect.size == (25, 20)  # 20px circle moved 5px; rest of screen untouched
+
+
+def test_background_matches_scanline_gradient_and_caches(screen, tmp_path):
+    ref = pygame.Surface((160, 120))
+    for y in range(120):
+        pygame.draw.line(ref, (y * 255 // 120, 0, 128), (0, y), (160, y))
+    room._BACKGROUNDS.clear()
+    built = room.make_background(160, 120, cache_dir=str(tmp_path))
+    assert np.array_equal(pygame.surfarray.array3d(built), pygame.surfarray.array3d(ref))
+    assert room.make_background(160, 120, cache_dir=str(tmp_path)) is built
+    (cached,) = tmp_path.glob("gradient_160x120_*.rgb")
+    room._BACKGROUNDS.clear()
+    loaded = room.make_background(160, 120, cache_dir=str(tmp_path))
+    assert loaded is not built
+    assert np.array_equal(pygame.surfarray.array3d(loaded), pygame.surfarray.array3d(ref))
+
+
+def test_background_cache_evicts_least_recently_used(screen, tmp_path):
+    room._BACKGROUNDS.clear()
+    entry = 160 * 120 * 3
+    palettes = [((0, 0, 0), (255, 255, 255)), ((9, 9, 9), (1, 2, 3)), ((5, 5, 5), (6, 6, 6))]
+    for i, palette in enumerate(palettes[:2]):
+        room.make_background(160, 120, palette, cache_dir=str(tmp_path), max_bytes=2 * entry)
+        os.utime(next(tmp_path.glob("gradient_*%02x%02x%02x.rgb" % palette[1])), (i, i))
+    room._BACKGROUNDS.clear()
+    room.make_background(160, 120, palettes[0], cache_dir=str(tmp_path), max_bytes=2 * entry)  # hit: now newest
+    room.make_background(160, 120, palettes[2], cache_dir=str(tmp_path), max_bytes=2 * entry)
+    names = sorted(p.name for p in tmp_path.glob("gradient_*.rgb"))
+    assert len(names) == 2 and not any(n.endswith("010203.rgb") for n in names)
+
+
+class _Keys(dict):
+    def __getitem__(self, key):
+        return self.get(key, False)
+
+
+def test_fixed_timestep_loop_is_frame_rate_independent(screen, tmp_path):
+    renderer = room.DirtyRectRenderer(screen, room.make_background(160, 120))
+    avatar = room.Sprite(20, 60)
+    keys = _Keys({pygame.K_RIGHT: True})
+    profiler = room.run_loop(renderer, avatar, [], 160, 120, seconds=0.1, fps=0, keys_fn=lambda: keys)
+    # 0.1 s of simulation is six 60 Hz steps of 5 px, however many frames rendered.
+    assert profiler.sim_steps == 6 and avatar.x == 50
+    summary = profiler.summary()
+    assert summary["frames"] >= 1
+    assert set(summary["frame"]) == {"mean", "p50", "p95", "p99", "max"}
+    profiler.write(tmp_path / "profile.json")
+    assert (tmp_path / "profile.json").read_text(encoding="utf-8").startswith("{")
+
+
+def test_interpolated_draw_between_steps(screen):
+    sprite = room.Sprite(20, 20)
+    sprite.save()
+    sprite.x = 40
+    assert sprite.draw(screen, alpha=0.5).center == (30, 20)
+
+
+def test_benchmark_harness_runs_scripted_trace():
+    import bench_immersive_room as bench
+
+    keys_fn = bench.scripted_keys([(2, ("K_RIGHT",)), (1, ())])
+    held = [keys_fn()[pygame.K_RIGHT] for _ in range(6)]
+    assert held == [True, True, False] * 2
+    for mode in ("full", "dirty"):
+        result = bench.run(mode, frames=30, width=160, height=120, sprites=5)
+        assert (result["renderer"], result["frames"], result["sim_steps"]) == (mode, 30, 30)
+        assert result["fps"] > 0 and result["frame"]["p99"] >= result["frame"]["p50"]
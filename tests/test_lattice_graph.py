@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers CSR routing and reachability in tools/lattice_graph.py.
+
+import random
+
+import pytest
+
+import lattice_graph as lg
+
+
+def _brute_dist(n, edges, a, b):
+    adj = {}
+    for u, v in edges:
+        adj.setdefault(u, []).append(v)
+    seen, frontier, d = {a}, [a], 0
+    while frontier:
+        if b in frontier:
+            return d
+        frontier = [v for u in frontier for v in adj.get(u, ()) if v not in seen and not seen.add(v)]
+        d += 1
+    return None
+
+
+def test_registry_lattice_routes_and_anchors():
+    g = lg.LatticeGraph.load()
+    assert g.n == 144 and g.dist is not None
+    route = g.route("The Fool", "The Star")
+    assert route[0] == 1 and route[-1] == 18 and len(route) - 1 == g.distance(1, 18)
+    assert g.resolve("MA16") == g.resolve("The Tower / Aeon") == 17
+    assert g.nodes[17]["letter"] == "Pe"
+    for a, b in zip(route, route[1:]):
+        assert b in g.neighbors(a)
+    assert len(g.reachable_from(144)) == 144  # every bridge lands within a gate's reach
+    # Without gates, bridges above the spine only climb.
+    one_way = lg.LatticeGraph(40, lg.lattice_edges(40, spine=10, gates=0))
+    assert one_way.reachable(12, 40) and not one_way.reachable(40, 12) and one_way.route(40, 12) is None
+    assert one_way.reachable_from(40) == [40] and one_way.route(3, 9) == [3, 4, 9]
+    with pytest.raises(KeyError):
+        g.route("The Unknown", 1)
+
+
+def test_every_octagram_node_attaches_once():
+    g = lg.LatticeGraph.load()
+    assert g.resolve("MA00") == g.resolve("The Fool") == 1
+    assert g.resolve("MA01") == g.resolve("The Magician") == g.resolve("The Magus") == 2
+    tarots = [node["tarot"] for node in lg._load(lg.ROOT, "registry/octagram_nodes_full.json", [])]
+    assert len(tarots) == 8
+    assert sorted(node["tarot"] for node in g.nodes.values()) == sorted(tarots)
+
+
+def test_colliding_anchors_raise():
+    reg = lg.CardRegistry.load()
+    with pytest.raises(ValueError):
+        lg.major_anchors(reg, 144, [("The Magician", 1)])
+    assert lg.major_anchors(reg, 144, [("The Magician", 1), ("The Fool", 30)])["The Magician"] == 1
+    assert "MA21" not in lg.major_anchors(reg, 21)  # past the lattice, not clamped onto node 21
+
+
+def test_all_pairs_and_lazy_rows_agree_with_bfs():
+    edges = lg.lattice_edges(300, spine=20, gates=50)
+    full = lg.LatticeGraph(300, edges)
+    lazy = lg.LatticeGraph(300, edges, apsp_limit=0)
+    assert lazy.dist is None
+    rng = random.Random(4)
+    for _ in range(200):
+        a, b = rng.randint(1, 300), rng.randint(1, 300)
+        expected = _brute_dist(300, edges, a, b)
+        assert full.distance(a, b) == lazy.distance(a, b) == expected
+        assert full.reachable(a, b) == lazy.reachable(a, b) == (expected is not None)
+        if expected is not None:
+            assert len(full.route(a, b)) == len(lazy.route(a, b)) == expected + 1
+    assert len(lazy._rows) <= lg.ROW_CACHE
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers tools/manifest_snapshot.py: sectioned build, lazy section reads and incremental rebuilds.
+import json
+import os
+
+import pytest
+
+from manifest_snapshot import Snapshot, build
+
+
+def write(root, rel, doc):
+    path = root / rel
+    os.makedirs(path.parent, exist_ok=True)
+    path.write_text(json.dumps(doc))
+    return path
+
+
+def bump(path, doc):
+    """Rewrite ``path`` and move its mtime on so the stat key changes even on coarse clocks."""
+    st = os.stat(path)
+    path.write_text(json.dumps(doc))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_repo_manifests_snapshot(tmp_path):
+    out = str(tmp_path / "snap.jsonl")
+    info = build(out=out)
+    snap = Snapshot(out)
+    assert {"arcana", "bridge", "codex", "engine", "geometry", "paths", "realm", "toggle"} <= set(snap)
+    assert snap.hash == info["hash"]
+    assert snap.section("bridge")["manifest"] == "bridge"
+    assert build(out=out)["written"] is False
+
+
+def test_incremental_rebuild_and_lazy_reads(tmp_path):
+    root = tmp_path / "repo"
+    a = write(root, "alpha/export/alpha_manifest.json", {"manifest": "alpha", "n": 1})
+    write(root, "beta/export/beta_manifest.json", {"manifest": "beta", "items": ["é", 2]})
+    c = write(root, "export/gamma_manifest.json", {"manifest": "gamma"})
+    out = str(root / "snap.jsonl")
+    first = build(str(root), out)
+    assert sorted(first["rebuilt"]) == ["alpha", "beta", "gamma"] and first["written"]
+    again = build(str(root), out)
+    assert again == dict(first, rebuilt=[], reused=["alpha", "beta", "gamma"], written=False)
+
+    bump(a, {"manifest": "alpha", "n": 2})
+    os.remove(c)
+    snap = Snapshot(out)
+    assert snap.stale(str(root)) == ["alpha", "gamma"]
+    third = build(str(root), out)
+    assert third["rebuilt"] == ["alpha"] and sorted(third["reused"]) == ["beta"]
+    assert third["removed"] == ["gamma"] and third["hash"] != first["hash"]
+
+    snap = Snapshot(out)
+    assert list(snap) == ["alpha", "beta"] and snap.stale(str(root)) == []
+    assert snap.section("alpha") == {"manifest": "alpha", "n": 2}
+    # Corrupt the beta body in place: alpha still loads, beta fails its hash check.
+    with open(out, "r+b") as f:
+        f.seek(snap._base + snap.sections["beta"]["offset"] + 2)
+        f.write(b"X")
+    fresh = Snapshot(out)
+    assert fresh.section("alpha")["n"] == 2
+    with pytest.raises(ValueError):
+        fresh.section("beta")
+
+
+def test_duplicate_section_names_are_rejected(tmp_path):
+    write(tmp_path, "one/export/same_manifest.json", {})
+    write(tmp_path, "two/export/same_manifest.json", {})
+    with pytest.raises(ValueError):
+        build(str(tmp_path), str(tmp_path / "snap.jsonl"))
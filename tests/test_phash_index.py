@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the multi-index phash lookups in tools/phash_index.py.
+
+import json
+import random
+
+import pytest
+
+import phash_index as pi
+from bench_phash_index import brute_pairs, synth_hashes
+
+
+@pytest.fixture(scope="module")
+def items():
+    return synth_hashes(1500, dup_ratio=0.03)
+
+
+def test_pairs_match_brute_force(items):
+    index = pi.PHashIndex(items)
+    ints = [(i, int(h, 16)) for i, h in items]
+    for k in (0, 3, 6):
+        assert index.pairs(k) == sorted(brute_pairs(ints, k))
+
+
+def test_pairs_at_or_past_full_width_include_complements():
+    items = [("a", "0f"), ("b", "f0"), ("c", "ff"), ("d", "0e")]
+    index = pi.PHashIndex(items)
+    ints = [(i, int(h, 16)) for i, h in items]
+    for k in (7, 8, 20):
+        assert index.pairs(k) == sorted(brute_pairs(ints, k))
+    assert (8, "a", "b") in index.pairs(8) and (8, "a", "b") not in index.pairs(7)
+
+
+def test_within_and_nearest_match_scan(items):
+    index = pi.PHashIndex(items)
+    rng = random.Random(1)
+    for item_id, phash in rng.sample(items, 40):
+        h = int(phash, 16)
+        dists = sorted((pi.hamming(h, int(x, 16)), i) for i, x in items if i != item_id)
+        for k in (2, 9, 14):
+            assert index.within(item_id, k) == [dx for dx in dists if dx[0] <= k]
+        assert [d for d, _ in index.nearest(item_id, 3)] == [d for d, _ in dists[:3]]
+    assert index.nearest("0" * 16, 2, max_distance=0) == index.within("0" * 16, 0)[:2]
+
+
+def test_catalog_loading_and_incremental_add(tmp_path):
+    catalog = tmp_path / "ASSET_CATALOG.json"
+    catalog.write_text(json.dumps([{"id": "a", "phash": "ff00ff00ff00ff00"}, {"id": "b", "phash": "ff00ff00ff00ff01"},
+                                   {"id": "c"}]), encoding="utf-8")
+    index = pi.PHashIndex.from_catalog(str(catalog))
+    assert len(index) == 2 and index.pairs(1) == [(1, "a", "b")]
+    assert index.nearest("a") == [(1, "b")]
+    index.add("d", "00ff00ff00ff00ff")
+    assert index.nearest("00ff00ff00ff00fe") == [(1, "d")]
+    with pytest.raises(ValueError):
+        index.add("e", "ff00")
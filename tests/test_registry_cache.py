@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the mtime-aware loader and shared-memory snapshots in tools/registry_cache.py.
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import registry_cache as rc
+
+
+@pytest.fixture(autouse=True)
+def _fresh():
+    rc.invalidate()
+    yield
+    rc.invalidate()
+
+
+def _write(path, doc, mtime):
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_reuses_until_file_changes(tmp_path):
+    p = tmp_path / "a.json"
+    _write(p, {"v": 1}, 1000)
+    first = rc.load_json(str(p))
+    assert rc.load_json(str(p)) is first
+    _write(p, {"v": 2}, 2000)
+    assert rc.load_json(str(p)) == {"v": 2}
+    info = rc.cache_info()
+    assert info["entries"] == 1
+    p.unlink()
+    with pytest.raises(FileNotFoundError):
+        rc.load_json(str(p))
+    assert rc.cache_info()["entries"] == 0
+
+
+def _worker_view(path):
+    before = rc.cache_info()["misses"]
+    doc = rc.load_json(path)
+    return doc, rc.cache_info()["misses"] - before
+
+
+def test_pool_workers_seed_from_snapshot(tmp_path):
+    good, bad = tmp_path / "good.json", tmp_path / "bad.json"
+    _write(good, {"nodes": list(range(5))}, 1000)
+    bad.write_text("{not json", encoding="utf-8")
+    shm = rc.publish([str(good), str(bad)])
+    try:
+        with ProcessPoolExecutor(2, initializer=rc.attach, initargs=(shm.name,)) as pool:
+            doc, parsed = pool.submit(_worker_view, str(good)).result()
+            assert doc == {"nodes": [0, 1, 2, 3, 4]} and parsed == 0
+            _write(good, {"nodes": []}, 2000)  # edited after the snapshot: worker re-reads
+            doc, parsed = pool.submit(_worker_view, str(good)).result()
+            assert doc == {"nodes": []} and parsed == 1
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the streaming Codex -> cards.json compiler in tools/registry_compile.py.
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import registry_compile as rc
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SAMPLE = """# Title
+intro text
+- Ray: ignored before first card
+
+## The Fool
+- Letter: Aleph
+- Ray: Violet
+- Angel/Demon: Metatron ↔ Naamah
+- Crystal: Clear Quartz (SiO2)
+- Ray: second value is ignored
+
+##\tnot a card
+- Letter: Nope
+
+## Two of Cups
+  - Technical: Solfeggio=639
+"""
+
+
+def test_iter_blocks_single_pass_fields():
+    blocks = list(rc.iter_blocks(SAMPLE.splitlines(True)))
+    assert [n for n, _ in blocks] == ["The Fool", "Two of Cups"]
+    assert blocks[0][1]["Ray"] == "Violet"
+    assert blocks[1][1] == {"Technical": "Solfeggio=639"}
+
+
+def test_build_card_derived_fields():
+    (name, fields), (name2, fields2) = rc.iter_blocks(SAMPLE.splitlines(True))
+    fool = rc.build_card(name, fields)
+    assert fool["id"] == "the_fool"
+    assert (fool["angel"], fool["demon"]) == ("Metatron", "Naamah")
+    assert (fool["crystal"], fool["chemistry"]) == ("Clear Quartz", "SiO2")
+    assert fool["freq"] == 963.0 and fool["suit"] == "majors"
+    cups = rc.build_card(name2, fields2)
+    assert cups["suit"] == "cups" and cups["freq"] == 639.0
+
+
+def test_compile_matches_committed_registry(tmp_path):
+    out = tmp_path / "cards.json"
+    rc.main([str(ROOT / "docs/codex_abyssiae_master.md"), str(out)])
+    expected = json.loads((ROOT / "assets/data/cards.json").read_text(encoding="utf-8"))
+    assert json.loads(out.read_text(encoding="utf-8")) == expected
+
+
+def test_incremental_reparses_only_changed_blocks(tmp_path):
+    src, out = tmp_path / "codex.md", tmp_path / "cards.json"
+    src.write_text(SAMPLE, encoding="utf-8")
+    cards, parsed, written = rc.compile_incremental(str(src), str(out))
+    assert (len(cards), parsed, written) == (2, 2, True)
+    assert (tmp_path / "cards.json.cache.json").exists()
+
+    cards, parsed, written = rc.compile_incremental(str(src), str(out))
+    assert (parsed, written) == (0, False)
+
+    src.write_text(SAMPLE.replace("Solfeggio=639", "Solfeggio=741"), encoding="utf-8")
+    cards, parsed, written = rc.compile_incremental(str(src), str(out))
+    assert (parsed, written) == (1, True)
+    assert json.loads(out.read_text(encoding="utf-8"))[1]["freq"] == 741.0
+    assert cards == list(rc.iter_cards(str(src)))
+
+
+def test_incremental_skips_write_when_cards_unchanged(tmp_path):
+    src, out = tmp_path / "codex.md", tmp_path / "cards.json"
+    src.write_text(SAMPLE, encoding="utf-8")
+    rc.compile_incremental(str(src), str(out))
+    # Trailing blank line alters the block hash but not the compiled card.
+    src.write_text(SAMPLE + "\n", encoding="utf-8")
+    _, parsed, written = rc.compile_incremental(str(src), str(out))
+    assert (parsed, written) == (1, False)
+
+
+def test_incremental_creates_missing_output_dir(tmp_path):
+    src, out = tmp_path / "codex.md", tmp_path / "out" / "cards.json"
+    src.write_text(SAMPLE, encoding="utf-8")
+    cards, parsed, written = rc.compile_incremental(str(src), str(out))
+    assert (len(cards), parsed, written) == (2, 2, True)
+    assert out.exists() and (tmp_path / "out" / "cards.json.cache.json").exists()
+
+
+def test_batch_merges_sources_with_provenance(tmp_path):
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    a.write_text(SAMPLE, encoding="utf-8")
+    b.write_text("## The Fool\n- Ray: Red\n\n## Ace of Wands\n- Ray: Scarlet\n", encoding="utf-8")
+    for jobs in (1, 2):
+        cards, dupes = rc.compile_batch([str(tmp_path / "*.md")], jobs=jobs)
+        assert dupes == 1
+        assert [(c["id"], Path(c["source"]).name) for c in cards] == [
+            ("the_fool", "a.md"), ("two_of_cups", "a.md"), ("ace_of_wands", "b.md"),
+        ]
+        assert cards[0]["ray"] == "Violet"
+
+
+def test_compile_cards_library_entry_point():
+    cards = rc.compile_cards(SAMPLE)
+    assert [c["id"] for c in cards] == ["the_fool", "two_of_cups"]
+    assert list(cards[0]) == ["id", "name", "suit"] + [out for out, _, _ in rc.FIELD_TABLE] + ["freq"]
+    assert rc.compile_cards(SAMPLE.splitlines(True)) == cards
+
+
+def test_parsing_imports_without_the_index_writer(monkeypatch):
+    monkeypatch.setitem(sys.modules, "cards_index", None)  # any import of it now fails
+    monkeypatch.syspath_prepend(str(ROOT))
+    monkeypatch.delitem(sys.modules, "tools.registry_compile", raising=False)
+    mod = importlib.import_module("tools.registry_compile")
+    assert [c["id"] for c in mod.compile_cards(SAMPLE)] == ["the_fool", "two_of_cups"]
+
+
+def test_field_table_ignores_unknown_keys_and_memoizes():
+    fields = rc.parse_fields(["- Ray: Silver\n", "- Ray-ish: nope\n", "- Unknown: x\n"])
+    assert fields == {"Ray": "Silver"}
+    rc.map_freq.cache_clear()
+    assert rc.map_freq("Silver") == rc.map_freq("Silver") == 852
+    assert rc.map_freq.cache_info().hits == 1
+    assert rc.suit("Queen of Blades") == "swords"
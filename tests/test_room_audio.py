@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the card-frequency mixer in examples/room_audio.py.
+
+import tracemalloc
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import room_audio as ra
+
+
+def test_wavetables_loop_seamlessly_and_are_cached():
+    bank = ra.WavetableBank(sample_rate=8000, block_frames=256)
+    table = bank.table(432.0)
+    assert bank.table(432.2) is table and len(table) == 8000 + 256
+    assert np.allclose(table[8000:], table[:256], atol=1e-5)
+
+
+def test_focus_crossfades_between_voices():
+    mixer = ra.CardMixer([432.0, 528.0], sample_rate=8000, channels=2, block_frames=256, fade_seconds=0.064)
+    mixer.focus(432.0)
+    for _ in range(2):
+        mixer.render_block()
+    a = next(v for v in mixer.voices if v.freq == 432.0)
+    assert a.gain == 1.0
+    mixer.focus(528.0)
+    block = mixer.render_block()
+    b = next(v for v in mixer.voices if v.freq == 528.0)
+    assert 0 < a.gain < 1 and 0 < b.gain < 1
+    assert block.shape == (256, 2) and np.array_equal(block[:, 0], block[:, 1])
+    mixer.render_block()
+    assert (a.gain, b.gain) == (0.0, 1.0)
+
+
+def test_voice_pool_is_bounded_and_render_does_not_allocate():
+    mixer = ra.CardMixer([float(f) for f in range(300, 320)], sample_rate=8000, block_frames=256, max_voices=3)
+    for f in range(300, 320):
+        mixer.focus(float(f))
+        mixer.render_block()
+    assert len(mixer.voices) == 3
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for f in range(300, 320):
+        mixer.focus(float(f))
+        out = mixer.render_block()
+    grown = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, "filename") if s.size_diff > 0)
+    tracemalloc.stop()
+    assert out is mixer.render_block()
+    assert grown < 16 * 1024
+
+
+def test_stolen_voice_fades_out_before_its_table_changes():
+    mixer = ra.CardMixer([300.0, 400.0, 500.0], sample_rate=8000, block_frames=256, max_voices=2,
+                         fade_seconds=0.256)  # eight blocks per fade
+    mixer.focus(300.0)
+    for _ in range(4):
+        mixer.render_block()
+    mixer.focus(400.0)
+    mixer.render_block()  # 300 fading out, 400 fading in: neither voice is free
+    old = next(v for v in mixer.voices if v.freq == 300.0)
+    old_table, gains = old.table, [old.gain]
+    mixer.focus(500.0)
+    assert old.pending == 500.0 and old.target == 0.0
+    while old.pending is not None:
+        assert old.table is old_table  # still the 300 Hz tone, still fading
+        mixer.render_block()
+        gains.append(old.gain)
+    assert gains[-2] == 0.0 and all(a > b for a, b in zip(gains[:-2], gains[1:-1]))
+    # Swapped at the silent block boundary, then faded in from zero.
+    assert old.freq == 500.0 and old.table is mixer.bank.table(500.0) and 0.0 < old.gain < 1.0
+
+
+def test_region_index_grid():
+    assert ra.region_index(0, 0, 800, 600, 3) == 0
+    assert ra.region_index(799, 0, 800, 600, 3) == 1
+    assert ra.region_index(10, 599, 800, 600, 3) == 2
+    assert ra.region_index(799, 599, 800, 600, 3) is None
+    assert ra.region_index(5, 5, 800, 600, 0) is None
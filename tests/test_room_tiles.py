@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the tiled world renderer in examples/room_tiles.py.
+
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+np = pytest.importorskip("numpy")
+
+import immersive_room as room
+import room_tiles as rt
+
+
+@pytest.fixture
+def screen():
+    pygame.display.init()
+    yield pygame.display.set_mode((320, 240))
+    pygame.display.quit()
+
+
+class _Counting(rt.ProceduralTiles):
+    def __init__(self):
+        super().__init__(tile_size=64)
+        self.built = []
+
+    def tile(self, tx, ty):
+        self.built.append((tx, ty))
+        return super().tile(tx, ty)
+
+
+def test_procedural_tiles_are_seamless_and_deterministic():
+    src = rt.ProceduralTiles(tile_size=64)
+    whole = rt.ProceduralTiles(tile_size=128).pixels(0, 0)
+    assert np.array_equal(src.pixels(1, 0), whole[64:, :64])
+    assert np.array_equal(src.pixels(1, 1), rt.ProceduralTiles(tile_size=64).pixels(1, 1))
+
+
+def test_cache_is_bounded_lru():
+    cache = rt.TileCache(_Counting(), max_tiles=3)
+    for key in [(0, 0), (1, 0), (2, 0), (0, 0), (3, 0)]:
+        cache.get(*key)
+    assert (1, 0) not in cache and (0, 0) in cache and len(cache) == 3
+    assert cache.stats() == {"tiles": 3, "max_tiles": 3, "hits": 1, "misses": 4, "evictions": 1}
+
+
+def test_camera_clamps_and_tile_range():
+    cam = rt.Camera(20000, 20000, 320, 240)
+    cam.follow(10, 10)
+    assert (cam.x, cam.y) == (0, 0)
+    cam.follow(19990, 19990)
+    assert (cam.x, cam.y) == (20000 - 320, 20000 - 240)
+    cols, rows = cam.tile_range(256, margin=1)
+    assert cols[-1] == 78 and rows[-1] == 78  # last tile column/row of a 20k world
+
+
+def test_memory_follows_viewport_not_world(screen):
+    counting = _Counting()
+    renderer = rt.TiledRenderer(screen, counting, 20000, 20000, tile_size=64)
+    avatar = room.Sprite(100, 100)
+    for _ in range(400):
+        avatar.save()
+        avatar.x += 40
+        avatar.y += 30
+        renderer.render([avatar])
+    assert len(renderer.tiles) <= renderer.tiles.max_tiles == rt.viewport_tiles(320, 240, 64)
+    assert len(counting.built) > 1000 and renderer.tiles.evictions > 0
+
+
+def test_prefetch_builds_tiles_ahead_of_the_avatar(screen):
+    counting = _Counting()
+    renderer = rt.TiledRenderer(screen, counting, 4096, 4096, tile_size=64, prefetch_per_frame=8)
+    avatar = room.Sprite(2048, 2048)
+    renderer.render([avatar])
+    cols, rows = renderer.camera.tile_range(64)
+    counting.built.clear()
+    avatar.save()
+    avatar.x += 1
+    renderer.render([avatar])
+    assert counting.built and all(tx == cols[-1] + 1 for tx, _ in counting.built)
+    # Walking onto the prefetched column needs no new builds for it.
+    avatar.save()
+    avatar.x += 64
+    counting.built.clear()
+    renderer.draw([avatar], alpha=1.0)
+    assert not [k for k in counting.built if k[0] == cols[-1] + 1]
+
+
+def test_art_tiles_fall_back_when_art_is_missing(tmp_path):
+    catalog = tmp_path / "assets" / "ASSET_CATALOG.json"
+    catalog.parent.mkdir()
+    catalog.write_text(json.dumps([{"id": "x", "variants": {"jpg": "assets/img/x-1280.jpg"}}]), encoding="utf-8")
+    assert rt.catalog_images(str(catalog)) == []
+    art = rt.ArtTiles([], tile_size=64)
+    assert art.tile(0, 0).get_size() == (64, 64)
+
+
+def test_art_tiles_scale_catalog_images(tmp_path):
+    img = tmp_path / "assets" / "img" / "x-1280.jpg"
+    img.parent.mkdir(parents=True)
+    surf = pygame.Surface((100, 50))
+    surf.fill((200, 10, 10))
+    pygame.image.save(surf, str(img))
+    catalog = tmp_path / "assets" / "ASSET_CATALOG.json"
+    catalog.write_text(json.dumps([{"id": "x", "variants": {"webp": [], "jpg": "assets/img/x-1280.jpg"}}]), encoding="utf-8")
+    art = rt.ArtTiles(rt.catalog_images(str(catalog)), tile_size=32, max_images=1)
+    tile = art.tile(3, 4)
+    assert tile.get_size() == (32, 32) and tile.get_at((16, 16))[0] > 150
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the portal spatial index in examples/room_world.py.
+
+import json
+import random
+
+import room_world as rw
+
+
+def _world(n=50, size=800):
+    return rw.RoomWorld.from_records([{"id": f"p{i}"} for i in range(n)], size, size)
+
+
+def test_near_matches_linear_scan():
+    world = _world()
+    rng = random.Random(3)
+    for _ in range(300):
+        x, y, r = rng.uniform(-50, 850), rng.uniform(-50, 850), rng.uniform(0, 120)
+        expected = {p.id for p in world.portals.values() if p.distance_to(x, y) <= r}
+        found = world.near(x, y, r)
+        assert {p.id for p in found} == expected
+        dists = [p.distance_to(x, y) for p in found]
+        assert dists == sorted(dists)
+
+
+def test_hit_remove_and_replace():
+    world = rw.RoomWorld(200, 200, cell_size=32)
+    world.add(rw.Portal("a", 10, 10, 50, 50))
+    world.add(rw.Portal("b", 100, 100, 20, 20))
+    assert [p.id for p in world.hit(30, 30)] == ["a"]
+    assert world.hit(90, 90) == []
+    world.add(rw.Portal("a", 130, 10, 20, 10))  # same id moves the portal
+    assert world.hit(30, 30) == [] and len(world.index) == 2
+    world.remove("b")
+    assert world.hit(105, 105) == [] and world.index._cells.keys() == {(4, 0)}
+
+
+def test_portal_hook_reports_changes(tmp_path):
+    path = tmp_path / "nodes.json"
+    path.write_text(json.dumps([{"tarot": "The Fool"}, {"tarot": "The Magician"}]), encoding="utf-8")
+    records, key = rw.load_portal_records(str(path))
+    world = rw.RoomWorld.from_records(records, 200, 100, key=key)
+    assert set(world.portals) == {"The Fool", "The Magician"}
+
+    class Avatar:
+        x, y = 50, 50
+
+    seen = []
+    hook = rw.portal_hook(world, 10, seen.append)
+    hook(Avatar)
+    hook(Avatar)
+    Avatar.x = 150
+    hook(Avatar)
+    Avatar.y = -500
+    hook(Avatar)
+    assert [p.id if p else None for p in seen] == ["The Fool", "The Magician", None]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the compiled schema validators in tools/schema_check.py.
+
+import json
+import os
+
+import pytest
+
+import schema_check as sc
+from bench_schema_check import synth_assets, synth_interface
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET = os.path.join(ROOT, "schemas", "asset.schema.json")
+INTERFACE = os.path.join(ROOT, "assets", "data", "interface.schema.json")
+
+
+def test_reports_every_error_per_record():
+    v = sc.compile_schema(ASSET)
+    good, = synth_assets(1, bad=0)
+    assert v.is_valid(good)
+    bad = dict(good, width="wide", variants={"avif": ["a"], "webp": ["b", 2]})
+    del bad["id"]
+    assert sorted(v.errors(bad)) == [
+        ("", "missing required property 'id'"),
+        ("/variants", "missing required property 'jpg'"),
+        ("/variants/webp/1", "expected string, got int"),
+        ("/width", "expected number, got str"),
+    ]
+
+
+def test_interface_payloads_and_repo_samples():
+    v = sc.compile_schema(INTERFACE)
+    with open(os.path.join(ROOT, "assets", "data", "sample_interface.json"), encoding="utf-8") as f:
+        assert v.errors(json.load(f)) == []
+    payloads = synth_interface(2000, bad=0.5)
+    flagged = dict(v.iter_errors(payloads))
+    assert flagged and len(flagged) < len(payloads)
+    errs = {p for p, _ in next(iter(flagged.values()))}
+    assert errs == {"/narrative_nodes/3/node_id", "/palettes/0/swatches/2", "/geometry_layers/1/kind"}
+
+
+def test_keyword_semantics():
+    v = sc.Validator({"type": "object", "additionalProperties": False, "properties": {
+        "n": {"type": "integer", "minimum": 1}, "flag": {"type": "boolean"},
+        "tag": {"enum": ["a", "b"]}, "any": {"maxLength": 2}}})
+    assert v.errors({"n": 2.0, "flag": False, "tag": "a", "any": 5}) == []
+    assert [p for p, _ in v.errors({"n": True, "flag": 0, "tag": "c", "x": 1})] == ["/n", "/flag", "/tag", ""]
+    assert v.errors({"n": 0}) == [("/n", "minimum 1")]
+    with pytest.raises(ValueError):
+        sc.Validator({"oneOf": [{"type": "string"}]})
+
+
+def test_boolean_schemas_and_json_equality():
+    v = sc.Validator({"properties": {"x": True, "never": False, "obj": {"properties": {"y": {}}}},
+                      "additionalProperties": {}, "items": False})
+    assert v.errors({"x": 1, "obj": {"y": 2}, "z": 3}) == []
+    assert v.errors({"never": 0}) == [("/never", "no value is allowed here")]
+    assert [p for p, _ in sc.Validator({"items": False}).errors([1, 2])] == ["/0", "/1"]
+    assert sc.Validator(True).is_valid(None) and not sc.Validator(False).is_valid(None)
+    with pytest.raises(ValueError):
+        sc.Validator({"properties": {"x": 3}})
+    num = sc.Validator({"properties": {"e": {"enum": [1, "a", [1, {"k": 2}]]}, "c": {"const": 1}}})
+    assert num.errors({"e": 1.0, "c": 1.0}) == []
+    assert num.errors({"e": [1.0, {"k": 2.0}]}) == []
+    assert [p for p, _ in num.errors({"e": True, "c": True})] == ["/e", "/c"]
+    assert not sc.Validator({"const": False}).is_valid(0)
+    assert not sc.Validator({"const": [True]}).is_valid([1])
+
+
+def test_compiled_once_until_schema_changes(tmp_path):
+    path = tmp_path / "s.json"
+    path.write_text(json.dumps({"type": "string"}), encoding="utf-8")
+    os.utime(path, (1000, 1000))
+    first = sc.compile_schema(str(path))
+    assert sc.compile_schema(str(path)) is first and first.errors(1)
+    path.write_text(json.dumps({"type": "integer"}), encoding="utf-8")
+    os.utime(path, (2000, 2000))
+    assert sc.compile_schema(str(path)).errors(1) == []
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers the streaming tone pipeline in examples/soundscape.py.
+
+import io
+import json
+import math
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import soundscape as ss
+
+
+def test_blocks_are_fixed_size_and_match_single_tone():
+    blocks = list(ss.tone_blocks([(440.0, 0.25)], sample_rate=8000, block_frames=512))
+    assert [len(b) for b in blocks] == [512, 512, 512, 464]
+    buf = np.concatenate(blocks)[:, 0].astype(int)
+    i = np.arange(len(buf))
+    ref = (32767 * np.sin(2 * math.pi * 440.0 * i / 8000)).astype(int)
+    assert np.abs(buf - ref).max() <= 1
+
+
+def test_frequency_changes_are_phase_continuous():
+    segs = [(432.0, 0.1), (528.0, 0.1), (963.0, 0.1)]
+    buf = np.concatenate(list(ss.tone_blocks(segs, sample_rate=44100, block_frames=1000)))[:, 0].astype(int)
+    # No jump larger than the steepest per-sample slope of the fastest tone.
+    max_step = 32767 * 2 * math.pi * 963.0 / 44100
+    assert np.abs(np.diff(buf)).max() <= max_step + 2
+
+
+def test_stream_wav_to_unseekable_sink(tmp_path):
+    class Sink(io.RawIOBase):
+        def __init__(self):
+            self.data = bytearray()
+
+        def writable(self):
+            return True
+
+        def write(self, b):
+            self.data += b
+            return len(b)
+
+    segs = [((220.0, 224.0), 0.05), ((330.0, 334.0), 0.05)]
+    sink = Sink()
+    frames = ss.stream_wav(sink, ss.tone_blocks(segs, 22050, channels=2), 22050, 2, n_frames=ss.segment_frames(segs, 22050))
+    with wave.open(io.BytesIO(bytes(sink.data))) as w:
+        assert (w.getnchannels(), w.getnframes()) == (2, frames) == (2, 2204)
+
+
+def test_card_segments_follow_deck_frequencies(tmp_path):
+    cards = tmp_path / "cards.json"
+    cards.write_text(json.dumps([{"id": "a", "freq": 432.0}, {"id": "b", "freq": 963.0}]), encoding="utf-8")
+    assert list(ss.card_segments(str(cards), 1.5, loops=2)) == [(432.0, 1.5), (963.0, 1.5)] * 2
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers tools/spread_sim.py: batch draws, reversal rate and tally consistency.
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spread_sim import Deck, draw, simulate
+
+
+def small_deck():
+    return Deck([
+        {"id": "a", "suit": "majors", "angel": "A1", "demon": "D1"},
+        {"id": "b", "suit": "majors", "angel": "A1", "demon": "D2"},
+        {"id": "c", "suit": "cups", "angel": "A2", "demon": "D1"},
+        {"id": "d", "suit": "cups"},
+        {"id": "e", "suit": "swords", "angel": "A2", "demon": "D2"},
+    ])
+
+
+def test_draws_are_unique_per_spread_and_seeded():
+    cards, flipped = draw(78, 5000, 10, np.random.default_rng(7), reversals=0.3)
+    assert cards.shape == flipped.shape == (5000, 10)
+    assert (np.sort(cards, axis=1)[:, 1:] != np.sort(cards, axis=1)[:, :-1]).all()
+    assert cards.min() >= 0 and cards.max() < 78
+    assert abs(flipped.mean() - 0.3) < 0.01
+    again, _ = draw(78, 5000, 10, np.random.default_rng(7), reversals=0.3)
+    assert (cards == again).all()
+    with pytest.raises(ValueError):
+        draw(5, 1, 6, np.random.default_rng(0))
+
+
+def test_tallies_match_brute_force():
+    deck = small_deck()
+    stats = simulate(deck, 3000, size=3, seed=3, chunk=512)
+    # Replay the same chunked stream and count by hand.
+    rng = np.random.default_rng(3)
+    expect = np.zeros_like(stats["angel_demon"])
+    card = np.zeros(len(deck), dtype=np.int64)
+    per_suit = np.zeros_like(stats["suit_per_spread"])
+    done = 0
+    while done < 3000:
+        b = min(512, 3000 - done)
+        cards, _ = draw(len(deck), b, 3, rng, 0.5)
+        for row in cards:
+            card += np.bincount(row, minlength=len(deck))
+            for s, n in enumerate(np.bincount(deck.codes["suit"][row], minlength=per_suit.shape[0])):
+                per_suit[s, n] += 1
+            for i in row:
+                for j in row:
+                    if i != j: expect[deck.codes["angel"][i], deck.codes["demon"][j]] += 1
+        done += b
+    assert (stats["card"] == card).all()
+    assert (stats["angel_demon"] == expect).all()
+    assert (stats["suit_per_spread"] == per_suit).all()
+    assert stats["suit"].sum() == stats["card"].sum() == 3000 * 3
+    assert (stats["position_suit"].sum(axis=1) == 3000).all()
+
+
+def test_canonical_deck():
+    deck = Deck.canonical()
+    assert len(deck) == 78
+    suits = deck.labels["suit"]
+    assert (deck.codes["suit"] == suits.index("majors")).sum() == 22
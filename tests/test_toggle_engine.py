@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Test framework: pytest.
+# Covers tools/toggle_engine.py: fused pipeline output, caching and the safety block.
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from toggle_engine import LUMA, ToggleEngine, compile_toggle, gradient, hex_rgb
+
+
+def reference(images, tint, intensity, tokens, amount):
+    """One effect at a time, in float64, the way the toggle reads."""
+    x = images.astype(np.float64)
+    x = x * (1 - intensity) + hex_rgb(tint) * intensity
+    lum = np.clip(np.rint(x @ LUMA), 0, 255).astype(int)
+    x = x * (1 - amount) + gradient(tokens)[lum] * amount
+    return np.clip(np.rint(x), 0, 255)
+
+
+def write_toggle(root, doc, nd_safe=True):
+    os.makedirs(root / "toggles", exist_ok=True)
+    os.makedirs(root / "export", exist_ok=True)
+    (root / "toggles" / f"{doc['id']}.toggle.json").write_text(json.dumps(doc))
+    (root / "export" / "toggle_manifest.json").write_text(json.dumps(
+        {"layer_map": {"The Star": {"GEOMETRY": "octagram", "SLOT": 3}}, "nd_safe": nd_safe}))
+
+
+def test_repo_toggle_matches_effect_by_effect():
+    engine = ToggleEngine()
+    pipe = engine.compile("LA-17-STAR")
+    assert engine.compile("LA-17-STAR") is pipe
+    assert len(pipe.stages) == 1
+    images = np.random.default_rng(1).integers(0, 256, (4, 32, 32, 3), dtype=np.uint8)
+    out = engine.apply("LA-17-STAR", images)
+    assert out.shape == images.shape and out.dtype == np.uint8
+    expect = reference(images, "#b1c7ff", 0.6, ["rose-quartz", "teal-glow"], 0.5)
+    assert np.abs(out.astype(int) - expect).max() <= 1
+    palette = engine.apply_palette("LA-17-STAR", {"bg": "#000000", "layers": ["#ffffff", "#808080"]})
+    assert set(palette) == {"bg", "layers"} and len(palette["layers"]) == 2
+    assert pipe.ready_unlocks() == []
+    assert pipe.ready_unlocks(confirmed=True) == [{"target": "C144N-034", "mode": "Art"}]
+
+
+def test_second_blend_starts_a_stage():
+    doc = {"id": "T", "effects": [{"type": "palette_blend", "tokens": ["void", "ink"]},
+                                  {"type": "overlay", "name": "warm", "intensity": 0.2},
+                                  {"type": "palette_blend", "tokens": ["rose-quartz"], "amount": 0.3}],
+           "safety": {"motion": "full"}}
+    pipe = compile_toggle(doc)
+    assert len(pipe.stages) == 2
+    images = np.random.default_rng(2).integers(0, 256, (2, 16, 16, 3), dtype=np.uint8)
+    x = images.astype(np.float64)
+    x = x * 0.5 + gradient(["void", "ink"])[np.clip(np.rint(x @ LUMA), 0, 255).astype(int)] * 0.5
+    x = x * 0.8 + hex_rgb("#ffe3a4") * 0.2
+    x = np.clip(np.rint(x), 0, 255)
+    x = x * 0.7 + gradient(["rose-quartz"])[np.clip(np.rint(x @ LUMA), 0, 255).astype(int)] * 0.3
+    assert np.abs(pipe.apply(images).astype(int) - np.clip(np.rint(x), 0, 255)).max() <= 1
+
+
+def test_safety_block():
+    base = {"id": "S", "effects": [{"type": "overlay", "color": "#ff0000", "intensity": 1.0}]}
+    calm = compile_toggle(dict(base, safety={"motion": "calm"}))
+    full = compile_toggle(dict(base, safety={"motion": "full"}))
+    px = np.zeros((1, 3), dtype=np.uint8)
+    assert calm.apply(px).tolist() == [[153, 0, 0]]  # intensity capped at 0.6
+    assert full.apply(px).tolist() == [[255, 0, 0]]
+    flashing = {"id": "F", "effects": [{"type": "strobe", "hz": 12}], "safety": {"strobe": True}}
+    with pytest.raises(ValueError):
+        compile_toggle(flashing)  # the nd_safe manifest default overrides the toggle
+    with pytest.raises(ValueError):
+        compile_toggle({"id": "U", "effects": [{"type": "overlay", "hz": 4, "color": "#ffffff"}]}, nd_safe=False)
+    auto = {"id": "A", "effects": [{"type": "unlock", "target": "X"}], "safety": {"autoplay": True}}
+    assert compile_toggle(auto).ready_unlocks() == []
+    assert compile_toggle(auto, nd_safe=False).ready_unlocks() == [{"target": "X", "mode": None}]
+
+
+def test_cache_follows_the_files(tmp_path):
+    doc = {"id": "LA-17-STAR", "effects": [{"type": "overlay", "color": "#000000", "intensity": 0.5}]}
+    write_toggle(tmp_path, doc)
+    engine = ToggleEngine(str(tmp_path))
+    first = engine.compile("LA-17-STAR")
+    assert engine.compile("LA-17-STAR") is first
+    assert engine.layer("Star") == {"GEOMETRY": "octagram", "SLOT": 3}
+    assert engine.layer("The Moon") is None
+    doc["effects"][0]["color"] = "#ffffff"
+    path = tmp_path / "toggles" / "LA-17-STAR.toggle.json"
+    path.write_text(json.dumps(doc) + "\n")
+    second = engine.compile("LA-17-STAR")
+    assert second is not first
+    assert second.apply(np.zeros((1, 3), dtype=np.uint8)).tolist() == [[128, 128, 128]]
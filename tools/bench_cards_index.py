@@ -0,0 +1,68 @@
+# Benchmark -- cards.json vs indexed cards.idx (payload size + lookup latency)
+# Usage: python tools/bench_cards_index.py [n_cards] [repeats]
+# Synthesises a deck, writes both artifacts to a temp dir, then times id
+# lookups and suit+name filters against the linear scan engine.js performs.
+import json, os, random, sys, tempfile, time
+
+from cards_index import CardIndex, write_index
+
+SUITS = ["majors", "wands", "cups", "swords", "pentacles"]
+SYLLABLES = ["ka", "ra", "mel", "tho", "ze", "bar", "un", "ish", "vo", "lum", "sa", "dri", "en", "qua", "ot"]
+
+def synth_deck(n, seed=7):
+    rng = random.Random(seed)
+    deck = []
+    for i in range(n):
+        word = lambda: "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+        name = f"{word()} of {word()} {i}"
+        deck.append({
+            "id": f"card_{i}", "name": name, "suit": rng.choice(SUITS),
+            "ray": rng.choice(["Violet", "Gold", "Crimson", "Silver"]),
+            "angel": "Metatron", "demon": "Naamah", "crystal": "Clear Quartz",
+            "technical": "Solfeggio=%d" % rng.choice([432, 528, 963]), "freq": float(rng.choice([432, 528, 963])),
+        })
+    return deck
+
+def timed(fn, repeats):
+    t0 = time.perf_counter()
+    for _ in range(repeats): fn()
+    return (time.perf_counter() - t0) / repeats * 1e6
+
+def main(argv):
+    n = int(argv[1]) if len(argv)>1 else 10000
+    repeats = int(argv[2]) if len(argv)>2 else 200
+    deck = synth_deck(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        js, idx_path = os.path.join(tmp, "cards.json"), os.path.join(tmp, "cards.idx")
+        with open(js, "w", encoding="utf-8") as f:
+            json.dump(deck, f, ensure_ascii=False, indent=2)
+        write_index(deck, idx_path)
+        minified = len(json.dumps(deck, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        print(f"cards: {n}")
+        print(f"size  cards.json (pretty): {os.path.getsize(js):>10} B")
+        print(f"size  cards.json (min):    {minified:>10} B")
+        print(f"size  cards.idx:           {os.path.getsize(idx_path):>10} B")
+
+        with open(js, "rb") as f: raw = f.read()
+        with open(idx_path, "rb") as f: blob = f.read()
+        print(f"open  json.loads:          {timed(lambda: json.loads(raw), 5):>10.1f} us")
+        print(f"open  CardIndex:           {timed(lambda: CardIndex(blob), 5):>10.1f} us")
+
+        cards, idx = json.loads(raw), CardIndex(blob)
+        probe = [f"card_{i}" for i in random.Random(1).sample(range(n), min(n, 64))]
+        scan_get = lambda: [next(c for c in cards if c["id"] == p) for p in probe]
+        print(f"get   linear scan x{len(probe)}:   {timed(scan_get, max(1, repeats // 20)):>10.1f} us")
+        print(f"get   CardIndex x{len(probe)}:     {timed(lambda: [idx.get(p) for p in probe], repeats):>10.1f} us")
+
+        # engine.js re-filters the whole deck per keystroke; the index narrows by
+        # suit bucket and trigram postings before touching any name.
+        for suit, q in [("cups", "melthoze"), ("all", "quadri"), ("all", "of lum"), ("swords", "ka")]:
+            scan = lambda: [c["id"] for c in cards if (suit == "all" or c["suit"] == suit) and q in c["name"].lower()]
+            hits = scan()
+            assert hits == idx.query_ids(suit, q)
+            print(f"query {suit:>6} {q!r:<11} ({len(hits):>5} hits) scan:       {timed(scan, repeats):>10.1f} us")
+            print(f"query {suit:>6} {q!r:<11} ({len(hits):>5} hits) index ids:  {timed(lambda: idx.query_ids(suit, q), repeats):>10.1f} us")
+            print(f"query {suit:>6} {q!r:<11} ({len(hits):>5} hits) index+50:   {timed(lambda: idx.query(suit, q, 50), repeats):>10.1f} us")
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,32 @@
+# Benchmark -- lattice build time and route / reachability query latency
+# Usage: python tools/bench_lattice_graph.py [n ...] [--queries Q] [--sources S]
+# Builds the lattice at each size (144 = the registry lattice; larger sizes
+# stand in for expansion decks) and times random route, distance and
+# reachability queries. Sizes above APSP_LIMIT answer from cached BFS rows,
+# so there queries start from a pool of --sources positions (players move
+# between nearby nodes; every new source costs one BFS).
+import random, sys, time
+
+from lattice_graph import APSP_LIMIT, LatticeGraph
+
+def main(argv):
+    q = int(argv[argv.index("--queries") + 1]) if "--queries" in argv else 20000
+    n_sources = int(argv[argv.index("--sources") + 1]) if "--sources" in argv else 64
+    sizes = [int(a) for i, a in enumerate(argv[1:], 1)
+             if a.isdigit() and argv[i - 1] not in ("--queries", "--sources")] or [144, 1024, 10000]
+    for n in sizes:
+        t = time.perf_counter(); graph = LatticeGraph.load(n=n); build = time.perf_counter() - t
+        rng = random.Random(n)
+        sources = [rng.randint(1, n) for _ in range(n if n <= APSP_LIMIT else n_sources)]
+        pairs = [(rng.choice(sources), rng.randint(1, n)) for _ in range(q)]
+        timings = {}
+        for name, fn in (("route", graph.route), ("distance", graph.distance), ("reachable", graph.reachable)):
+            t = time.perf_counter()
+            for a, b in pairs: fn(a, b)
+            timings[name] = (time.perf_counter() - t) / q * 1e6
+        mode = "all-pairs" if n <= APSP_LIMIT else "lazy rows"
+        print(f"n={n:>6} {len(graph.indices):>7} edges  build {build:7.3f} s ({mode})  "
+              + "  ".join(f"{k} {v:8.2f} us" for k, v in timings.items()))
+
+if __name__ == "__main__":
+    main(sys.argv)
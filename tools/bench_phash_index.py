@@ -0,0 +1,51 @@
+# Benchmark -- phash pair/nearest queries: PHashIndex vs. the brute-force scan
+# Usage: python tools/bench_phash_index.py [n ...] [--k K]
+# Synthesises random 64-bit hashes with ~1% planted near-duplicates (1-3 bit
+# flips), then times building the index, all pairs within k, within-k and
+# unbounded nearest lookups, against brute-force pairs (small n) and a scan.
+import random, sys, time
+
+from phash_index import PHashIndex, hamming
+
+def synth_hashes(n, dup_ratio=0.01, seed=5):
+    rng = random.Random(seed)
+    hashes = [rng.getrandbits(64) for _ in range(n)]
+    for i in rng.sample(range(n), int(n * dup_ratio)):
+        h = hashes[rng.randrange(n)]
+        for bit in rng.sample(range(64), rng.randint(1, 3)): h ^= 1 << bit
+        hashes[i] = h
+    return [(f"art_{i}", "%016x" % h) for i, h in enumerate(hashes)]
+
+def brute_pairs(hashes, k):
+    return [(d, a, b) for i, (a, ha) in enumerate(hashes) for b, hb in hashes[i + 1:]
+            if (d := hamming(ha, hb)) <= k]
+
+def main(argv):
+    k = int(argv[argv.index("--k") + 1]) if "--k" in argv else 4
+    sizes = [int(a) for a in argv[1:] if a.isdigit() and a != str(k)] or [1000, 10000, 50000]
+    for n in sizes:
+        items = synth_hashes(n)
+        t = time.perf_counter(); index = PHashIndex(items); build = time.perf_counter() - t
+        t = time.perf_counter(); pairs = index.pairs(k); pair_s = time.perf_counter() - t
+        probes = [items[i][0] for i in range(0, n, max(1, n // 200))]
+        index.tables()
+        t = time.perf_counter()
+        for p in probes: index.within(p, k)
+        within_us = (time.perf_counter() - t) / len(probes) * 1e6
+        t = time.perf_counter()
+        for p in probes: index.nearest(p)
+        near_us = (time.perf_counter() - t) / len(probes) * 1e6
+        ints = [(i, int(h, 16)) for i, h in items]
+        t = time.perf_counter()
+        for p in probes[:50]:
+            hp = index.hashes[index.rows[p]]; min(hamming(hp, h) for i, h in ints if i != p)
+        scan_us = (time.perf_counter() - t) / len(probes[:50]) * 1e6
+        line = (f"n={n:>6} build {build:6.3f} s  pairs<={k}: {len(pairs):>5} in {pair_s:6.3f} s  "
+                f"within {within_us:7.1f} us  nearest {near_us:8.1f} us  (scan {scan_us:8.1f} us)")
+        if n <= 5000:
+            t = time.perf_counter(); ref = brute_pairs(ints, k); brute_s = time.perf_counter() - t
+            line += f"  brute pairs {len(ref)} in {brute_s:.3f} s"
+        print(line)
+
+if __name__ == "__main__":
+    main(sys.argv)
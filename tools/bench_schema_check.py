@@ -0,0 +1,65 @@
+# Benchmark -- compiled schema validation over large synthetic record streams
+# Usage: python tools/bench_schema_check.py [n_records] [bad_ratio]
+# Synthesises ASSET_CATALOG-shaped records and interface-shaped palettes /
+# narrative nodes (a fraction deliberately broken), then times compile and
+# bulk validation with tools/schema_check.py; jsonschema is timed too when
+# it happens to be installed.
+import os, random, sys, time
+
+from schema_check import compile_schema
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def synth_assets(n, bad=0.05, seed=11):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        base = f"art_{i}"
+        rec = {"id": base, "original": f"assets/originals/{base}.png",
+               "variants": {"avif": [f"assets/img/{base}-{w}.avif" for w in (1280, 1920)],
+                            "webp": [f"assets/img/{base}-{w}.webp" for w in (1280, 1920)],
+                            "jpg": f"assets/img/{base}-1280.jpg"},
+               "width": rng.choice([1600, 2400, 3000]), "height": rng.choice([1200, 1800]), "phash": "%016x" % rng.getrandbits(64)}
+        if rng.random() < bad:
+            del rec["variants"]["jpg"]; rec["width"] = "wide"; rec["variants"]["webp"][1] = 1920
+        out.append(rec)
+    return out
+
+def synth_interface(n, bad=0.05, seed=13):
+    """One interface payload per 100 records: 50 narrative nodes, 25 palettes, 25 geometry layers."""
+    rng = random.Random(seed)
+    out = []
+    for p in range(max(1, n // 100)):
+        nodes = [{"node_id": i, "name": f"Node {i}", "locked": bool(i % 2), "egregore_id": f"eg_{i}",
+                  "gods": [{"name": "Thoth", "culture": "Egyptian"}], "fusion_tags": ["star", "gate"],
+                  "links": [f"node_{i + 1}"]} for i in range(50)]
+        palettes = [{"id": f"pal_{i}", "name": "Abyss", "provenance": "codex",
+                     "swatches": ["#%06x" % rng.getrandbits(24) for _ in range(6)]} for i in range(25)]
+        layers = [{"id": f"geo_{i}", "kind": rng.choice(["mesh", "field", "path", "sdf"]),
+                   "data_ref": f"geometry/{i}.json", "immutable": True} for i in range(25)]
+        if rng.random() < bad:
+            nodes[3]["node_id"] = "3"; palettes[0]["swatches"][2] = "red"; layers[1]["kind"] = "voxel"
+        out.append({"version": "1.0.0", "palettes": palettes, "geometry_layers": layers, "narrative_nodes": nodes})
+    return out
+
+def bench(name, schema_path, records):
+    t = time.perf_counter(); v = compile_schema(schema_path); compile_ms = (time.perf_counter() - t) * 1e3
+    t = time.perf_counter(); bad = sum(1 for _ in v.iter_errors(records)); secs = time.perf_counter() - t
+    print(f"{name:<9} {len(records):>7} records  compile {compile_ms:6.2f} ms  "
+          f"validate {secs:6.3f} s  ({len(records) / secs:>10,.0f} rec/s)  invalid {bad}")
+    try:
+        import jsonschema
+    except ImportError:
+        return
+    ref = jsonschema.Draft202012Validator(v.schema)
+    t = time.perf_counter(); ref_bad = sum(1 for r in records if next(ref.iter_errors(r), None)); secs = time.perf_counter() - t
+    print(f"{'':<9} jsonschema validate {secs:6.3f} s  ({len(records) / secs:>10,.0f} rec/s)  invalid {ref_bad}")
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 100000
+    bad = float(argv[2]) if len(argv) > 2 else 0.05
+    bench("asset", os.path.join(ROOT, "schemas", "asset.schema.json"), synth_assets(n, bad))
+    bench("interface", os.path.join(ROOT, "assets", "data", "interface.schema.json"), synth_interface(n, bad))
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,158 @@
+# Card Registry -- cross-registry join over the four card sources, built once
+# Usage: python tools/card_registry.py [--root DIR] KEY [KEY ...]
+#
+# Sources (relative to the repo root; a missing one joins as empty):
+#   data/codex_of_abyssiae.json      canonical ids (MA00, W01..), titles, codex slugs
+#   registry/crosswalk.json          id -> codex/letter/planet/shem/goetia (majors)
+#   registry/octagram_nodes_full.json  lattice nodes keyed by tarot title
+#   assets/data/cards.json           compiled cards keyed by slug id
+# Every canonical card gets one prebuilt joined view (compiled cards that
+# join no card, e.g. the quick_start/paths/safety pages, are kept apart in
+# ``unmatched`` rather than becoming views); hash indexes on id,
+# legacy id, codex slug, normalised title and Hebrew letter (name or glyph)
+# resolve a key to its view with a dict lookup. Views are shared: read-only.
+# Sources come through registry_cache, so reloading after an edit only
+# reparses the files that changed.
+import json, os, re, sys
+from registry_cache import load_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = {
+    "codex": "data/codex_of_abyssiae.json",
+    "crosswalk": "registry/crosswalk.json",
+    "nodes": "registry/octagram_nodes_full.json",
+    "cards": "assets/data/cards.json",
+}
+SUITS = {"W": "wands", "C": "cups", "S": "swords", "P": "pentacles"}
+GLYPHS = dict(zip("אבגדהוזחטיכלמנסעפצקרשת", [
+    "aleph", "beth", "gimel", "daleth", "heh", "vav", "zayin", "cheth", "teth", "yod", "kaph",
+    "lamed", "mem", "nun", "samekh", "ayin", "pe", "tzaddi", "qoph", "resh", "shin", "tav"]))
+LETTER_ALIASES = {"he": "heh", "vau": "vav", "heth": "cheth", "tsaddi": "tzaddi", "tzaddi": "tzaddi",
+                  "qof": "qoph", "kuf": "qoph", "peh": "pe", "taw": "tav", "tau": "tav", "yodh": "yod"}
+
+def title_key(s):
+    """'The Tower / Aeon' -> 'tower'; 'High Priestess' == 'The High Priestess'."""
+    s = s.split("/")[0].strip().lower()
+    if s.startswith("the "): s = s[4:]
+    return re.sub(r"[^a-z0-9]+", "", s)
+
+def letter_key(s):
+    s = (s or "").strip()
+    s = GLYPHS.get(s, s).lower()
+    return LETTER_ALIASES.get(s, s)
+
+def load_sources(root=ROOT):
+    out = {}
+    for name, rel in SOURCES.items():
+        path = os.path.join(root, rel)
+        out[name] = load_json(path) if os.path.exists(path) else None
+    return out
+
+def codex_entries(codex):
+    """Canonical rows as dicts, majors then minors in suit order."""
+    canon = (codex or {}).get("canonical", {})
+    for cid, title, persona, letter, slug in canon.get("major", []):
+        yield {"id": cid, "title": title, "persona": persona, "letter": letter, "codex": slug, "suit": "majors"}
+    for prefix, rows in canon.get("minor", {}).items():
+        for cid, title, epithet in rows:
+            yield {"id": cid, "title": title, "epithet": epithet, "letter": None, "codex": None,
+                   "suit": SUITS.get(prefix, prefix)}
+
+class CardRegistry:
+    def __init__(self, codex=None, crosswalk=None, nodes=None, cards=None):
+        self.views, self.by_slug, self.by_title, self.by_letter, self.keys = {}, {}, {}, {}, {}
+        self.legacy = dict((codex or {}).get("compat", {}).get("legacy_to_canonical", {}))
+        self.canonical = []  # codex ids in deck order
+        self.unmatched = []  # compiled cards that join no view
+        for entry in codex_entries(codex):
+            self.canonical.append(entry["id"])
+            view = dict(entry, crosswalk=None, node=None, card=None)
+            self.views[entry["id"]] = view
+            self._index(view)
+        for x in (crosswalk or {}).get("major", []):
+            view = self.views.get(x["id"]) or self._adopt({"id": x["id"], "title": x.get("name", x["id"]),
+                                                          "letter": x.get("letter"), "codex": x.get("codex"),
+                                                          "suit": "majors"})
+            view["crosswalk"] = x
+            if not view["codex"] and x.get("codex"): view["codex"] = x["codex"]; self.by_slug[x["codex"]] = view["id"]
+        for node in nodes or []:
+            view = self._match(title=node.get("tarot"), letter=node.get("letter"))
+            if view is None: view = self._adopt({"id": node["tarot"], "title": node["tarot"], "letter": node.get("letter"), "suit": "majors"})
+            view["node"] = node
+        for card in cards or []:
+            view = self.views.get(self.by_slug.get(card["id"], "")) or self._match(title=card.get("name"), letter=card.get("letter"))
+            if view is None: self.unmatched.append(card); continue
+            view["card"] = card
+            self.by_slug.setdefault(card["id"], view["id"])
+        # Exact spellings seen in the sources resolve in one lookup; anything else is normalised.
+        for v in self.views.values():
+            for raw in (v["title"], v["letter"], (v["node"] or {}).get("tarot"), (v["card"] or {}).get("name")):
+                if raw: self.keys.setdefault(raw, self.resolve(raw))
+        for glyph in GLYPHS: self.keys.setdefault(glyph, self.resolve(glyph))
+        self.keys.update((k, v) for k, v in self.legacy.items() if v in self.views)
+        self.keys.update((k, v) for k, v in self.by_slug.items())
+        self.keys.update((k, k) for k in self.views)
+        self.keys = {k: v for k, v in self.keys.items() if v is not None}
+
+    def _index(self, view):
+        cid = view["id"]
+        if view.get("codex"): self.by_slug.setdefault(view["codex"], cid)
+        if view.get("title"): self.by_title.setdefault(title_key(view["title"]), cid)
+        if view.get("letter"): self.by_letter.setdefault(letter_key(view["letter"]), cid)
+
+    def _adopt(self, entry):
+        view = {"id": entry["id"], "title": entry.get("title"), "letter": entry.get("letter"),
+                "codex": entry.get("codex"), "suit": entry.get("suit"), "crosswalk": None, "node": None, "card": None}
+        self.views[view["id"]] = view
+        self._index(view)
+        return view
+
+    def _match(self, title=None, letter=None):
+        cid = self.by_title.get(title_key(title)) if title else None
+        if cid is None and letter: cid = self.by_letter.get(letter_key(letter))
+        return self.views.get(cid) if cid else None
+
+    @classmethod
+    def load(cls, root=ROOT):
+        s = load_sources(root)
+        return cls(s["codex"], s["crosswalk"], s["nodes"], s["cards"])
+
+    def __len__(self): return len(self.views)
+    def __iter__(self): return iter(self.views.values())
+    def __contains__(self, key): return self.resolve(key) is not None
+
+    def resolve(self, key):
+        """Canonical id for an id, legacy id, codex slug, title or Hebrew letter; None if unknown."""
+        cid = self.keys.get(key)
+        if cid is not None: return cid
+        k = str(key)
+        for table, norm in ((self.legacy, k.lower()), (self.by_slug, k), (self.by_letter, letter_key(k)),
+                            (self.by_title, title_key(k))):
+            cid = table.get(norm) if norm else None
+            if cid in self.views: return cid
+        return None
+
+    def get(self, key, default=None):
+        cid = self.resolve(key)
+        return self.views[cid] if cid is not None else default
+
+    def by_suit(self, suit):
+        return [v for v in self.views.values() if v["suit"] == suit]
+
+def main(argv):
+    root = ROOT
+    if argv[:1] == ["--root"]: root, argv = argv[1], argv[2:]
+    reg = CardRegistry.load(root)
+    if not argv:
+        print(f"{len(reg)} cards; {sum(1 for v in reg if v['crosswalk'])} crosswalked, "
+              f"{sum(1 for v in reg if v['node'])} lattice nodes, {sum(1 for v in reg if v['card'])} compiled cards")
+        return 0
+    missing = 0
+    for key in argv:
+        view = reg.get(key)
+        if view is None: print(f"{key}: not found", file=sys.stderr); missing += 1
+        else: print(json.dumps(view, ensure_ascii=False))
+    return 1 if missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
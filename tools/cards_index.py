@@ -0,0 +1,177 @@
+# Card Index -- compact, versioned binary companion to cards.json
+# Usage: python tools/cards_index.py [cards_idx] [id | --suit S --q TEXT]
+#
+# Layout (little-endian):
+#   b"LACI" | u16 version | u16 row width (2|4) | u32 header_len | header JSON
+#   | postings (rows, row width each) | u32[trigrams+1] trigram offsets
+#   | u32[count+1] record offsets | records
+# The header holds the key order, newline-joined ids and names, [start, len]
+# spans into the postings array for every suit bucket and the frequency
+# order, and the sorted lowercase-name trigrams concatenated (3 characters
+# each); trigram i owns postings[start + off[i]:start + off[i+1]]. Records
+# are minified JSON value arrays of every field but id and name (already in
+# the header), decoded only when a lookup returns them. The artifact comes
+# out smaller than minified cards.json (~1.6 MB vs 1.85 MB at 10k cards in
+# tools/bench_cards_index.py), postings included.
+import json, struct, sys
+from array import array
+
+MAGIC = b"LACI"
+VERSION = 2
+INLINE = ("id", "name")  # header-held fields, left out of uniform records
+PREFIX = struct.Struct("<4sHHI")
+
+def trigrams(s):
+    return {s[i:i+3] for i in range(len(s) - 2)}
+
+def _le(arr):
+    if sys.byteorder != "little": arr.byteswap()
+    return arr
+
+def build_index(cards):
+    """Serialise cards plus lookup indexes; returns the artifact bytes."""
+    ids = [c["id"] for c in cards]
+    names = [c.get("name", "") for c in cards]
+    if any("\n" in s for s in ids + names): raise ValueError("card ids/names must be single-line")
+    keys = list(cards[0]) if cards else []
+    fields = [k for k in keys if k not in INLINE]
+    width = 2 if len(cards) < 0xFFFF else 4
+    postings = array("H" if width == 2 else "I")
+
+    def span(rows):
+        start = len(postings)
+        postings.extend(rows)
+        return [start, len(rows)]
+
+    suits, tri = {}, {}
+    for row, c in enumerate(cards):
+        suits.setdefault(c.get("suit", ""), []).append(row)
+        for t in trigrams(names[row].lower()):
+            tri.setdefault(t, []).append(row)
+    header = {
+        "version": VERSION, "count": len(cards), "keys": keys,
+        "ids": "\n".join(ids), "names": "\n".join(names),
+        "suits": {s: span(rows) for s, rows in suits.items()},
+        "by_freq": span(sorted(range(len(cards)), key=lambda r: (cards[r].get("freq", 0), r))),
+    }
+    tri_start, tri_offsets = len(postings), array("I", [0])
+    for t in sorted(tri):
+        postings.extend(tri[t]); tri_offsets.append(len(postings) - tri_start)
+    header["trigrams"], header["postings"] = ["".join(sorted(tri)), tri_start], len(postings)
+    # Uniform cards drop their keys and the header-held fields; anything
+    # irregular is stored as a plain object.
+    records = [json.dumps([c[k] for k in fields] if list(c) == keys else c,
+                          ensure_ascii=False, separators=(",", ":")).encode("utf-8") for c in cards]
+    offsets = array("I", [0])
+    for r in records: offsets.append(offsets[-1] + len(r))
+    head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"".join([PREFIX.pack(MAGIC, VERSION, width, len(head)), head,
+                     _le(postings).tobytes(), _le(tri_offsets).tobytes(), _le(offsets).tobytes()] + records)
+
+def write_index(cards, path):
+    with open(path, "wb") as f:
+        f.write(build_index(cards))
+
+class CardIndex:
+    """Read-only view over a cards index; records are decoded on demand."""
+
+    def __init__(self, data):
+        magic, version, width, head_len = PREFIX.unpack_from(data, 0)
+        if magic != MAGIC: raise ValueError("not a cards index")
+        if version != VERSION: raise ValueError(f"unsupported cards index version {version}")
+        pos = PREFIX.size
+        header = json.loads(bytes(data[pos:pos+head_len]).decode("utf-8"))
+        pos += head_len
+        self.count, self.keys = header["count"], header["keys"]
+        self.fields = [k for k in self.keys if k not in INLINE]
+        self.ids = header["ids"].split("\n") if self.count else []
+        self.display_names = header["names"].split("\n") if self.count else []
+        self.names = [n.lower() for n in self.display_names]
+        self.suits = header["suits"]
+        self.rows = {i: r for r, i in enumerate(self.ids)}
+        tri_keys, tri_start = header["trigrams"]
+        n_tri, n_post = len(tri_keys) // 3, header["postings"]
+        self.postings = array("H" if width == 2 else "I")
+        self.postings.frombytes(bytes(data[pos:pos + width * n_post]))
+        pos += width * n_post
+        tri_offsets = array("I")
+        tri_offsets.frombytes(bytes(data[pos:pos + 4 * (n_tri + 1)]))
+        pos += 4 * (n_tri + 1)
+        self.offsets = array("I")
+        self.offsets.frombytes(bytes(data[pos:pos + 4 * (self.count + 1)]))
+        _le(self.postings), _le(tri_offsets), _le(self.offsets)
+        self.trigrams = {tri_keys[3*i:3*i+3]: (tri_start + tri_offsets[i], tri_offsets[i+1] - tri_offsets[i])
+                         for i in range(n_tri)}
+        self.blob = memoryview(data)[pos + 4 * (self.count + 1):]
+        self._by_freq = header["by_freq"]
+        self.suit_codes = {s: i for i, s in enumerate(self.suits)}
+        self.row_suits = [0] * self.count
+        for s, span in self.suits.items():
+            for r in self._span(span): self.row_suits[r] = self.suit_codes[s]
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, card_id):
+        return card_id in self.rows
+
+    def _span(self, span):
+        start, n = span
+        return self.postings[start:start+n]
+
+    def record(self, row):
+        value = json.loads(bytes(self.blob[self.offsets[row]:self.offsets[row+1]]).decode("utf-8"))
+        if not isinstance(value, list): return value
+        card = dict(zip(self.fields, value))
+        card.update(id=self.ids[row], name=self.display_names[row])
+        return {k: card[k] for k in self.keys}
+
+    def get(self, card_id, default=None):
+        row = self.rows.get(card_id)
+        return default if row is None else self.record(row)
+
+    def match_rows(self, suit=None, q=None):
+        """Rows (deck order) whose suit equals `suit` and lowercase name contains `q`."""
+        suit = None if suit == "all" else suit
+        if suit is not None and suit not in self.suits: return []
+        q = (q or "").lower()
+        if len(q) >= 3:
+            # Postings of the rarest trigram bound the candidates; the name
+            # check below settles the rest.
+            start, n = min((self.trigrams.get(t, (0, 0)) for t in trigrams(q)), key=lambda s: s[1])
+            rows = self.postings[start:start+n]
+            if suit is not None:
+                code = self.suit_codes[suit]
+                rows = [r for r in rows if self.row_suits[r] == code]
+        else:
+            rows = self._span(self.suits[suit]) if suit is not None else range(self.count)
+        names = self.names
+        return [r for r in rows if q in names[r]] if q else list(rows)
+
+    def query_ids(self, suit=None, q=None):
+        return [self.ids[r] for r in self.match_rows(suit, q)]
+
+    def query(self, suit=None, q=None, limit=None):
+        return [self.record(r) for r in self.match_rows(suit, q)[:limit]]
+
+    def by_frequency(self, limit=None):
+        return [self.record(r) for r in self._span(self._by_freq)[:limit]]
+
+def main(argv):
+    path = argv[1] if len(argv)>1 else "assets/data/cards.idx"
+    idx = CardIndex.open(path)
+    rest = argv[2:]
+    if rest and not rest[0].startswith("--"):
+        print(json.dumps(idx.get(rest[0]), ensure_ascii=False, indent=2))
+        return
+    opts = dict(zip(rest[::2], rest[1::2]))
+    for c in idx.query(opts.get("--suit"), opts.get("--q")):
+        print(f'{c["id"]}\t{c["suit"]}\t{c["name"]}')
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,204 @@
+# Lattice Graph -- CSR adjacency, all-pairs routes and reachability for the octagram lattice
+# Usage: python tools/lattice_graph.py [--n N] [FROM TO]   (FROM/TO: node id or tarot title)
+#
+# Nodes are numbered 1..N, N = registry/constants.json "lattice" (144) unless
+# overridden for expansion decks. lattice_edges() derives the links:
+#   spine    nodes 1..spine form a two-way chain (the 33 spine)
+#   bridges  every node steps forward by each docs/bridges.json fibonacci step
+#   gates    the first `gates` nodes (99) may also take their bridges back
+# Major arcana (by title or canonical id) anchor to node arcanum + 1 (the
+# Fool on 1, the Magician on 2), overridden by bridges.json
+# major_arcana_to_codex; titles the card registry does not know (The Magus)
+# alias the card already on that node, and two cards on one node raise.
+# octagram_nodes_full.json records attach to their anchored node, again
+# one per node. Adjacency is CSR (array "I" indptr/indices);
+# for N <= APSP_LIMIT one BFS per source fills flat distance and predecessor
+# tables plus a reachability bitmask per node up front, so route queries
+# are table walks. Larger lattices compute rows on demand and keep the
+# most recent ROW_CACHE of them.
+import os, sys
+from array import array
+from collections import OrderedDict
+
+from card_registry import CardRegistry, title_key
+from registry_cache import load_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APSP_LIMIT = 1024
+ROW_CACHE = 256
+
+def _load(root, rel, default):
+    path = os.path.join(root, rel)
+    return load_json(path) if os.path.exists(path) else default
+
+def major_anchors(registry, n, overrides=()):
+    """{title or id: node} for the major arcana of ``registry`` on an ``n``-node lattice.
+
+    Arcanum k sits on node k + 1; ``overrides`` are (title, node) pairs that
+    move a known card, or alias an unknown title to that node. Raises
+    ValueError when two different cards end up on one node.
+    """
+    node_of, titles, aliases = {}, {}, []
+    for view in registry.by_suit("majors"):
+        cid = view["id"]
+        if cid.startswith("MA") and cid[2:].isdigit() and int(cid[2:]) + 1 <= n:
+            node_of[cid], titles[cid] = int(cid[2:]) + 1, (cid, view["title"])
+    for title, node in overrides:
+        if not 1 <= node <= n: continue
+        cid = registry.resolve(title)
+        if cid in node_of: node_of[cid] = node
+        else: aliases.append((title, node))
+    owner = {}
+    for cid, v in node_of.items():
+        if v in owner: raise ValueError(f"{owner[v]} and {cid} both anchor to lattice node {v}")
+        owner[v] = cid
+    anchors = {t: node_of[cid] for cid in node_of for t in titles[cid]}
+    anchors.update(aliases)
+    return anchors
+
+def lattice_edges(n, spine=33, gates=99, steps=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)):
+    """Directed (u, v) edges of an ``n``-node lattice, ids 1..n."""
+    edges = set()
+    for u in range(1, min(spine, n)):
+        edges.add((u, u + 1)); edges.add((u + 1, u))
+    for u in range(1, n + 1):
+        for s in set(steps):
+            v = u + s
+            if s > 0 and v <= n:
+                edges.add((u, v))
+                if u <= gates: edges.add((v, u))
+    return sorted(edges)
+
+def bfs(indptr, indices, n, src):
+    """(dist, pred) rows from ``src`` (0-based); -1 marks unreachable / no predecessor."""
+    dist, pred = array("i", [-1]) * n, array("i", [-1]) * n
+    dist[src], frontier, d = 0, [src], 0
+    while frontier:
+        d += 1
+        nxt = []
+        for u in frontier:
+            for i in range(indptr[u], indptr[u + 1]):
+                v = indices[i]
+                if dist[v] < 0: dist[v], pred[v] = d, u; nxt.append(v)
+        frontier = nxt
+    return dist, pred
+
+class LatticeGraph:
+    def __init__(self, n, edges, anchors=None, nodes=None, apsp_limit=APSP_LIMIT):
+        self.n = n
+        counts = [0] * (n + 1)
+        for u, v in edges:
+            if not (1 <= u <= n and 1 <= v <= n): raise ValueError(f"edge {(u, v)} outside 1..{n}")
+            counts[u] += 1
+        self.indptr = array("I", [0]) * (n + 1)
+        for u in range(n): self.indptr[u + 1] = self.indptr[u] + counts[u + 1]
+        fill = array("I", self.indptr)
+        self.indices = array("I", [0]) * len(edges)
+        for u, v in sorted(edges):
+            self.indices[fill[u - 1]] = v - 1; fill[u - 1] += 1
+        self.anchors = {title_key(k): v for k, v in (anchors or {}).items()}
+        self.nodes = dict(nodes or {})
+        self._rows = OrderedDict()
+        self.dist = self.pred = self.reach = None
+        if n <= apsp_limit: self._all_pairs()
+
+    @classmethod
+    def load(cls, root=ROOT, n=None, **kw):
+        consts = _load(root, "registry/constants.json", {})
+        bridges = _load(root, "docs/bridges.json", {})
+        n = n or consts.get("lattice", 144)
+        edges = lattice_edges(n, consts.get("spine", 33), consts.get("gates", 99),
+                              bridges.get("fibonacci_steps") or (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144))
+        overrides = [(b["card"], b.get("node_id", 0)) for b in bridges.get("major_arcana_to_codex", [])]
+        graph = cls(n, edges, major_anchors(CardRegistry.load(root), n, overrides), **kw)
+        for node in _load(root, "registry/octagram_nodes_full.json", []):
+            v = graph.resolve(node.get("tarot", ""))
+            if v is None: continue
+            if v in graph.nodes:
+                raise ValueError(f"octagram records {graph.nodes[v].get('tarot')!r} and {node.get('tarot')!r} "
+                                 f"both anchor to lattice node {v}")
+            graph.nodes[v] = node
+        return graph
+
+    def _all_pairs(self):
+        n = self.n
+        self.dist, self.pred, self.reach = array("i"), array("i"), []
+        for s in range(n):
+            dist, pred = bfs(self.indptr, self.indices, n, s)
+            self.dist.extend(dist); self.pred.extend(pred)
+            self.reach.append(sum(1 << v for v in range(n) if dist[v] >= 0))
+
+    def _row(self, s):
+        """(dist, pred) views for 0-based source ``s``."""
+        if self.dist is not None:
+            lo = s * self.n
+            return self.dist[lo:lo + self.n], self.pred[lo:lo + self.n]
+        row = self._rows.get(s)
+        if row is None:
+            row = self._rows[s] = bfs(self.indptr, self.indices, self.n, s)
+            while len(self._rows) > ROW_CACHE: self._rows.popitem(last=False)
+        else:
+            self._rows.move_to_end(s)
+        return row
+
+    def resolve(self, key):
+        """Node id for an int id (1..n) or an anchored tarot title; None if unknown."""
+        if isinstance(key, int) or (isinstance(key, str) and key.isdigit()):
+            v = int(key)
+            return v if 1 <= v <= self.n else None
+        return self.anchors.get(title_key(key))
+
+    def _index(self, key):
+        v = self.resolve(key)
+        if v is None: raise KeyError(key)
+        return v - 1
+
+    def neighbors(self, v):
+        v = self._index(v) + 1
+        return [i + 1 for i in self.indices[self.indptr[v - 1]:self.indptr[v]]]
+
+    def distance(self, a, b):
+        """Hop count from a to b, or None when b is unreachable."""
+        a, b = self._index(a), self._index(b)
+        d = self.dist[a * self.n + b] if self.dist is not None else self._row(a)[0][b]
+        return d if d >= 0 else None
+
+    def route(self, a, b):
+        """Shortest list of node ids from a to b, or None when unreachable."""
+        a, b = self._index(a), self._index(b)
+        if self.dist is not None:
+            pred, base = self.pred, a * self.n
+            if self.dist[base + b] < 0: return None
+        else:
+            dist, pred = self._row(a); base = 0
+            if dist[b] < 0: return None
+        path = [b]
+        while path[-1] != a: path.append(pred[base + path[-1]])
+        return [v + 1 for v in reversed(path)]
+
+    def reachable(self, a, b):
+        a, b = self._index(a), self._index(b)
+        if self.reach is not None: return bool(self.reach[a] >> b & 1)
+        return self._row(a)[0][b] >= 0
+
+    def reachable_from(self, a):
+        a = self._index(a)
+        if self.reach is not None:
+            mask = self.reach[a]
+            return [v + 1 for v in range(self.n) if mask >> v & 1]
+        return [v + 1 for v, d in enumerate(self._row(a)[0]) if d >= 0]
+
+def main(argv):
+    n = None
+    if argv[:1] == ["--n"]: n, argv = int(argv[1]), argv[2:]
+    graph = LatticeGraph.load(n=n)
+    if len(argv) == 2:
+        path = graph.route(*argv)
+        print(" -> ".join(map(str, path)) if path else "unreachable")
+        return 0 if path else 1
+    print(f"{graph.n} nodes, {len(graph.indices)} edges, {len(graph.anchors)} anchored titles, "
+          f"{len(graph.nodes)} octagram nodes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
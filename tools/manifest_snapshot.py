@@ -0,0 +1,147 @@
+# Manifest Snapshot -- every sub-project export manifest in one content-hashed, sectioned file
+# Usage: python tools/manifest_snapshot.py [--root DIR] [--out PATH] [--section NAME]
+#
+# build() gathers */export/*_manifest.json plus the root export/ manifests
+# into OUT (assets/data/manifest_snapshot.cache.jsonl). Line one is the
+# header index: per section (the manifest's file stem: arcana, bridge,
+# codex, ...) its source path, source stat key, sha256 and the byte
+# offset/length of its body; then one canonical JSON line per section. The
+# snapshot hash covers every section hash, so consumers can key their own
+# caches on it. A rebuild only re-parses sources whose (mtime_ns, size)
+# moved; unchanged sections are copied across as raw bytes, and when
+# nothing moved the file is left alone. Snapshot reads just the header and
+# parses a section on first access by seeking to its offset, so loading
+# the bridge manifest never touches the other sections.
+import hashlib, json, os, sys, time
+
+from registry_cache import load_json, registry_paths
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT = os.path.join("assets", "data", "manifest_snapshot.cache.jsonl")
+PATTERNS = ("*/export/*_manifest.json", "export/*_manifest.json")
+FORMAT = "manifest-snapshot/1"
+
+def section_name(path):
+    name = os.path.basename(path)
+    return name[:-len("_manifest.json")] if name.endswith("_manifest.json") else os.path.splitext(name)[0]
+
+def canonical(doc):
+    return json.dumps(doc, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def snapshot_hash(sections):
+    h = hashlib.sha256()
+    for name in sorted(sections): h.update(f"{name}:{sections[name]['sha256']}\n".encode())
+    return h.hexdigest()
+
+def read_header(path):
+    """(header, body offset) of an existing snapshot, or (None, 0) if missing or not a snapshot."""
+    try:
+        with open(path, "rb") as f: line = f.readline()
+    except FileNotFoundError:
+        return None, 0
+    try: header = json.loads(line)
+    except ValueError: return None, 0
+    if not isinstance(header, dict) or header.get("format") != FORMAT: return None, 0
+    return header, len(line)
+
+def build(root=ROOT, out=None, patterns=PATTERNS):
+    """Write (or refresh) the snapshot; returns {"hash", "rebuilt", "reused", "removed", "written"}."""
+    out = os.path.join(root, OUT) if out is None else out
+    old, base = read_header(out)
+    old_sections = old["sections"] if old else {}
+    bodies, sections, rebuilt, reused = {}, {}, [], []
+    with open(out, "rb") if old else open(os.devnull, "rb") as prev:
+        for path in registry_paths(root, patterns):
+            name, rel = section_name(path), os.path.relpath(path, root).replace(os.sep, "/")
+            if name in sections: raise ValueError(f"{rel}: section {name!r} already comes from {sections[name]['source']}")
+            st = os.stat(path)
+            stat = [st.st_mtime_ns, st.st_size]
+            prior = old_sections.get(name)
+            if prior and prior["source"] == rel and prior["stat"] == stat:
+                prev.seek(base + prior["offset"])
+                body = prev.read(prior["length"])
+                reused.append(name)
+            else:
+                try: body = canonical(load_json(path))
+                except ValueError as e: raise ValueError(f"{rel}: {e}") from None
+                (reused if prior and prior["sha256"] == hashlib.sha256(body).hexdigest() else rebuilt).append(name)
+            bodies[name] = body
+            sections[name] = {"source": rel, "stat": stat, "sha256": hashlib.sha256(body).hexdigest()}
+    removed = sorted(set(old_sections) - set(sections))
+    offset = 0
+    for name in sorted(sections):
+        sections[name].update(offset=offset, length=len(bodies[name]))
+        offset += len(bodies[name]) + 1
+    header = {"format": FORMAT, "hash": snapshot_hash(sections), "sections": sections}
+    written = old != header
+    if written:
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        tmp = f"{out}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(header, sort_keys=True).encode("utf-8") + b"\n")
+            for name in sorted(sections): f.write(bodies[name] + b"\n")
+        os.replace(tmp, out)
+    return {"hash": header["hash"], "rebuilt": rebuilt, "reused": reused, "removed": removed, "written": written}
+
+class Snapshot:
+    """Lazy reader: the header is parsed on open, each section on first access."""
+
+    def __init__(self, path=None, verify=True):
+        self.path = os.path.join(ROOT, OUT) if path is None else path
+        header, self._base = read_header(self.path)
+        if header is None: raise ValueError(f"{self.path}: not a {FORMAT} file")
+        self.hash, self.sections, self.verify = header["hash"], header["sections"], verify
+        self._loaded = {}
+
+    def __contains__(self, name): return name in self.sections
+    def __iter__(self): return iter(sorted(self.sections))
+    def __len__(self): return len(self.sections)
+
+    def raw(self, name):
+        """Canonical JSON bytes of one section, checked against its sha256 when ``verify``."""
+        entry = self.sections[name]
+        with open(self.path, "rb") as f:
+            f.seek(self._base + entry["offset"])
+            body = f.read(entry["length"])
+        if self.verify and hashlib.sha256(body).hexdigest() != entry["sha256"]:
+            raise ValueError(f"{self.path}: section {name!r} does not match its hash")
+        return body
+
+    def section(self, name):
+        doc = self._loaded.get(name)
+        if doc is None: doc = self._loaded[name] = json.loads(self.raw(name))
+        return doc
+
+    def stale(self, root=ROOT):
+        """Sections whose source has moved on disk since the snapshot was built."""
+        out = []
+        for name, entry in self.sections.items():
+            try: st = os.stat(os.path.join(root, entry["source"]))
+            except FileNotFoundError: out.append(name); continue
+            if [st.st_mtime_ns, st.st_size] != entry["stat"]: out.append(name)
+        return sorted(out)
+
+def load_section(name, path=None):
+    return Snapshot(path).section(name)
+
+def main(argv):
+    root, out, section = ROOT, None, None
+    it = iter(argv)
+    for a in it:
+        if a == "--root": root = next(it)
+        elif a == "--out": out = next(it)
+        elif a == "--section": section = next(it)
+    t = time.perf_counter(); info = build(root, out); secs = time.perf_counter() - t
+    print(f"snapshot {info['hash'][:16]} in {secs*1e3:.2f} ms: rebuilt {info['rebuilt'] or '-'}, "
+          f"reused {len(info['reused'])}, removed {info['removed'] or '-'}"
+          f"{'' if info['written'] else ' (unchanged, not rewritten)'}", file=sys.stderr)
+    snap = Snapshot(out or os.path.join(root, OUT))
+    if section:
+        if section not in snap: print(f"no section {section!r}; have {list(snap)}", file=sys.stderr); return 1
+        print(json.dumps(snap.section(section), ensure_ascii=False, indent=2))
+    else:
+        for name in snap: print(f"{name}\t{snap.sections[name]['source']}\t{snap.sections[name]['sha256'][:12]}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,159 @@
+# PHash Index -- Hamming-distance index over the catalog's perceptual hashes
+# Usage: python tools/phash_index.py [catalog] [--k 4] [--near ID_OR_HEX [--limit N]]
+#
+# Reads the phash strings scripts/optimize.mjs already stores in
+# assets/ASSET_CATALOG.json (no re-hashing of originals) and answers:
+#   pairs(k)          every pair of entries within Hamming distance k
+#   within(h, k)      every entry within k of an id or hash
+#   nearest(h, n)     the n closest entries to an id or hash
+# Both use multi-index hashing. Hashes are cut into m bit chunks; by
+# pigeonhole two hashes within k agree to within k // m bits on at least
+# one chunk, so a query probes each chunk table for the nearby chunk
+# values and only compares the rows it finds. pairs() uses k + 1 chunks,
+# so only exact chunk collisions need comparing. When probing would cost
+# more than comparing every row, a query falls back to a plain scan.
+import heapq, json, os, sys
+from itertools import combinations
+from math import comb
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG = os.path.join(ROOT, "assets", "ASSET_CATALOG.json")
+# Chunk width of the query tables; ~log2(rows) keeps buckets near one row
+# for archives of tens of thousands of images.
+CHUNK_BITS = 16
+# A bucket probe costs about this many row comparisons; past that budget a scan is cheaper.
+PROBE_COST = 4
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+def chunk_cuts(bits, m):
+    return [bits * i // m for i in range(m + 1)]
+
+def flips(value, width, r):
+    """Every ``width``-bit value within ``r`` bit flips of ``value``."""
+    yield value
+    for n in range(1, r + 1):
+        for pos in combinations(range(width), n):
+            v = value
+            for p in pos: v ^= 1 << p
+            yield v
+
+class PHashIndex:
+    def __init__(self, items=()):
+        self.ids, self.hashes, self.bits, self.rows = [], [], None, {}
+        self._tables = None  # [(lo, width, {chunk: [rows]})], built on first query
+        for item_id, phash in items: self.add(item_id, phash)
+
+    @classmethod
+    def from_catalog(cls, path=CATALOG):
+        with open(path, "r", encoding="utf-8") as f: entries = json.load(f)
+        return cls((e["id"], e["phash"]) for e in entries if e.get("phash"))
+
+    def __len__(self): return len(self.ids)
+
+    def parse(self, phash):
+        """Hex phash -> int, checking every hash in one index has the same width."""
+        if isinstance(phash, int): return phash
+        bits = len(phash) * 4
+        if self.bits is None: self.bits = bits
+        elif bits != self.bits: raise ValueError(f"phash {phash!r} is {bits} bits, index holds {self.bits}")
+        return int(phash, 16)
+
+    def add(self, item_id, phash):
+        h, row = self.parse(phash), len(self.ids)
+        self.ids.append(item_id); self.hashes.append(h); self.rows.setdefault(item_id, row)
+        for lo, width, table in self._tables or ():
+            table.setdefault((h >> lo) & ((1 << width) - 1), []).append(row)
+        return row
+
+    def tables(self):
+        if self._tables is None:
+            bits = self.bits or 64
+            cuts = chunk_cuts(bits, max(1, -(-bits // CHUNK_BITS)))
+            self._tables = []
+            for lo, hi in zip(cuts, cuts[1:]):
+                mask, table = (1 << (hi - lo)) - 1, {}
+                for row, h in enumerate(self.hashes): table.setdefault((h >> lo) & mask, []).append(row)
+                self._tables.append((lo, hi - lo, table))
+        return self._tables
+
+    def _lookup(self, phash):
+        """(hash, row to skip) for a catalog id -- the image itself is not its own match -- or a hash."""
+        row = self.rows.get(phash)
+        if row is not None: return self.hashes[row], row
+        return self.parse(phash), None
+
+    def _probes(self, r):
+        """Bucket lookups a query with per-chunk radius ``r`` needs."""
+        return sum(comb(width, i) for _, width, _ in self.tables() for i in range(r + 1))
+
+    def within(self, phash, k):
+        """[(distance, id)] for every entry within ``k`` of an id or hash, nearest first."""
+        h, skip = self._lookup(phash)
+        tables = self.tables()
+        r = k // len(tables)
+        if self._probes(r) * PROBE_COST >= len(self):
+            rows = range(len(self))
+        else:
+            rows = set()
+            for lo, width, table in tables:
+                for v in flips((h >> lo) & ((1 << width) - 1), width, r): rows.update(table.get(v, ()))
+        hashes, ids = self.hashes, self.ids
+        return sorted((d, ids[row]) for row in rows if row != skip and (d := (h ^ hashes[row]).bit_count()) <= k)
+
+    def nearest(self, phash, limit=1, max_distance=None):
+        """The ``limit`` closest [(distance, id)], widening the radius one chunk flip at a time."""
+        top = (self.bits or 64) if max_distance is None else max_distance
+        m, r = len(self.tables()), 0
+        while self._probes(r) * PROBE_COST < len(self):
+            k = min(m * (r + 1) - 1, top)
+            found = self.within(phash, k)
+            if len(found) >= limit or k >= top: return found[:limit]
+            r += 1
+        h, skip = self._lookup(phash)
+        dists = ((hamming(h, x), row) for row, x in enumerate(self.hashes) if row != skip)
+        return [(d, self.ids[row]) for d, row in heapq.nsmallest(limit, dists) if d <= top]
+
+    def pairs(self, k):
+        """Sorted [(distance, id_a, id_b)] for every pair within ``k`` (row order a < b)."""
+        if len(self) < 2: return []
+        bits = self.bits or max(h.bit_length() for h in self.hashes)
+        if k >= bits:
+            # Too few bits for k + 1 chunks, so the pigeonhole bound fails;
+            # every pair is within k anyway.
+            hashes, ids = self.hashes, self.ids
+            return sorted((hamming(hashes[a], hashes[b]), ids[a], ids[b])
+                          for a, b in combinations(range(len(self)), 2))
+        cuts = chunk_cuts(bits, k + 1)
+        found = {}
+        for lo, hi in zip(cuts, cuts[1:]):
+            mask, buckets = (1 << (hi - lo)) - 1, {}
+            for row, h in enumerate(self.hashes): buckets.setdefault((h >> lo) & mask, []).append(row)
+            for rows in buckets.values():
+                for i, a in enumerate(rows):
+                    ha = self.hashes[a]
+                    for b in rows[i + 1:]:
+                        if (a, b) not in found:
+                            d = hamming(ha, self.hashes[b])
+                            if d <= k: found[(a, b)] = d
+        return sorted((d, self.ids[a], self.ids[b]) for (a, b), d in found.items())
+
+def main(argv):
+    args, k, near, limit = [], 4, None, 5
+    it = iter(argv)
+    for a in it:
+        if a == "--k": k = int(next(it))
+        elif a == "--near": near = next(it)
+        elif a == "--limit": limit = int(next(it))
+        else: args.append(a)
+    index = PHashIndex.from_catalog(args[0] if args else CATALOG)
+    if near:
+        for d, item_id in index.nearest(near, limit): print(f"{item_id}\thamming={d}")
+        return 0
+    for d, a, b in index.pairs(k): print("possible-dupe:", a, "<→>", b, "hamming≈", d)
+    print(f"{len(index)} hashed entries", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
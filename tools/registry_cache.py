@@ -0,0 +1,104 @@
+# Registry Cache -- memoized, mtime-aware JSON loading with shared-memory snapshots
+# Usage: python tools/registry_cache.py [--root DIR]   (times cold vs. warm loads)
+#
+# load_json(path) parses a file once per (mtime_ns, size) and hands every
+# later caller the same object until the file changes on disk, so treat the
+# result as read-only. For process pools, publish() pickles the parsed
+# registries into one shared-memory block; pass attach as the pool
+# initializer and each worker seeds its cache from that block instead of
+# opening and parsing every file. Seeded entries keep their stat key, so a
+# worker still re-reads any file edited after the snapshot was taken.
+import glob, json, os, pickle, struct, sys, threading, time
+from multiprocessing import shared_memory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATTERNS = ("registry/*.json", "data/*.json", "*/export/*_manifest.json")
+LENGTH = struct.Struct("<Q")
+
+_cache = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+def _stat_key(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def load_json(path):
+    """Parsed JSON for ``path``; reparsed only when its mtime or size changes."""
+    path = os.path.abspath(path)
+    try:
+        key = _stat_key(path)
+    except FileNotFoundError:
+        with _lock: _cache.pop(path, None)
+        raise
+    entry = _cache.get(path)
+    if entry is not None and entry[0] == key:
+        _stats["hits"] += 1
+        return entry[1]
+    with open(path, "r", encoding="utf-8") as f: doc = json.load(f)
+    with _lock:
+        _cache[path] = (key, doc)
+        _stats["misses"] += 1
+    return doc
+
+def invalidate(path=None):
+    """Forget one path, or everything when ``path`` is None."""
+    with _lock:
+        if path is None: _cache.clear()
+        else: _cache.pop(os.path.abspath(path), None)
+
+def cache_info():
+    return {"entries": len(_cache), **_stats}
+
+def registry_paths(root=ROOT, patterns=PATTERNS):
+    return sorted(p for pat in patterns for p in glob.glob(os.path.join(root, pat)))
+
+def preload(paths):
+    """Load every path (skipping unparsable files); returns {abspath: (stat key, doc)}."""
+    out = {}
+    for p in paths:
+        try: load_json(p)
+        except (OSError, ValueError): continue
+        entry = _cache.get(os.path.abspath(p))
+        if entry: out[os.path.abspath(p)] = entry
+    return out
+
+def publish(paths=None):
+    """Snapshot the parsed registries into shared memory; caller closes and unlinks it."""
+    blob = pickle.dumps(preload(registry_paths() if paths is None else paths), protocol=pickle.HIGHEST_PROTOCOL)
+    shm = shared_memory.SharedMemory(create=True, size=LENGTH.size + len(blob))
+    LENGTH.pack_into(shm.buf, 0, len(blob))
+    shm.buf[LENGTH.size:LENGTH.size + len(blob)] = blob
+    return shm
+
+def attach(name):
+    """Pool initializer: seed this process's cache from the snapshot ``name``."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        (n,) = LENGTH.unpack_from(shm.buf, 0)
+        view = shm.buf[LENGTH.size:LENGTH.size + n]
+        try: entries = pickle.loads(view)
+        finally: view.release()
+    finally:
+        shm.close()
+    with _lock:
+        for path, entry in entries.items(): _cache.setdefault(path, entry)
+    return len(entries)
+
+def main(argv):
+    root = argv[1] if argv[:1] == ["--root"] else ROOT
+    paths = registry_paths(root)
+    t = time.perf_counter(); preload(paths); cold = time.perf_counter() - t
+    t = time.perf_counter(); preload(paths); warm = time.perf_counter() - t
+    shm = publish(paths)
+    try:
+        invalidate()
+        t = time.perf_counter(); attach(shm.name); seeded = time.perf_counter() - t
+    finally:
+        shm.close(); shm.unlink()
+    print(f"{len(paths)} registries: cold {cold*1e3:.2f} ms, warm {warm*1e3:.3f} ms, "
+          f"attach {seeded*1e3:.3f} ms ({shm.size} B snapshot)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
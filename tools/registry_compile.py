@@ -1,68 +1,229 @@
 # Registry Compiler -- Codex Abyssiae -> cards.json
-# Usage: python tools/registry_compile.py [in_md] [out_json]
-import re, json, sys, os
+# Usage: python tools/registry_compile.py [in_md] [out_json] [--incremental]
+#        python tools/registry_compile.py --batch <md|glob>... [--out json] [--jobs N]
+# Streams the markdown once, line by line: "## " opens a card block and
+# "- Key: value" lines fill it, so cost tracks input size, not field count.
+# Fields come from the declarative FIELD_TABLE, matched by one combined
+# pattern; in-process callers use compile_cards(markdown_text).
+# --incremental keeps a sidecar cache (<out_json>.cache.json) of block hash ->
+# compiled card, re-parses only changed blocks and skips unchanged writes.
+# --batch parses every source in a process pool and merges one deck; the first
+# source defining an id wins and each card records it under "source".
+# Every write also emits <out_json stem>.idx, the indexed binary registry
+# read by tools/cards_index.py.
+import re, json, os, glob, hashlib, argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
-INP = sys.argv[1] if len(sys.argv)>1 else "docs/codex_abyssiae_master.md"
-OUT = sys.argv[2] if len(sys.argv)>2 else "assets/data/cards.json"
+CACHE_VERSION = 1
 
-with open(INP, "r", encoding="utf-8") as f:
-    md = f.read()
+HEADER = re.compile(r"^##\s+(.+?)\s*$")
+SOLFEGGIO = re.compile(r"Solfeggio\s*=\s*([\d\.]+)")
+CHEM = re.compile(r"\(([^)]+)\)")
 
-blocks = [b for b in re.split(r"\n(?=##\s)", md) if b.startswith("## ")]
+def _pair(i):
+    def get(v):
+        if "↔" not in v: return ""
+        parts = [p.strip() for p in v.split("↔")]
+        return parts[i] if len(parts) > i else ""
+    return get
 
-def field(b, k):
-    m = re.search(r"-\s*%s:\s*([^\n]+)" % re.escape(k), b)
+def _crystal(v):
+    return v.split("(")[0].strip()
+
+def _chemistry(v):
+    m = CHEM.search(v)
     return m.group(1).strip() if m else ""
 
+# Card field <- markdown "- Key:" line, optional transform; order is output order.
+FIELD_TABLE = (
+    ("letter", "Letter", None), ("astrology", "Astrology", None), ("ray", "Ray", None),
+    ("angel", "Angel/Demon", _pair(0)), ("demon", "Angel/Demon", _pair(1)),
+    ("deities", "Deities", None),
+    ("crystal", "Crystal", _crystal), ("chemistry", "Crystal", _chemistry),
+    ("artifact", "Artifact", None), ("pigment", "Pigment", None),
+    ("tara", "Secret Tara", None), ("thought", "Thought-form", None),
+    ("hga_fragment", "HGA Fragment", None), ("pattern_glyph", "Pattern Glyph", None),
+    ("psyche", "Psyche", None), ("technical", "Technical", None),
+    ("appPulls", "App Pulls", None),
+)
+# One alternation over every known key, longest first, compiled once.
+FIELD_LINE = re.compile(r"^\s*-\s*(%s)\s*:\s*(.*?)\s*$" % "|".join(
+    re.escape(k) for k in sorted({k for _, k, _ in FIELD_TABLE}, key=len, reverse=True)))
+
+SUIT_RULES = (("wands", ("wands",)), ("cups", ("cups",)),
+              ("pentacles", ("pentacles", "coin")), ("swords", ("swords", "blade")))
+RAY_FREQS = ((963, ("violet",)), (852, ("indigo", "silver")),
+             (528, ("gold", "emerald", "green", "aquamarine", "turquoise")),
+             (417, ("crimson",)), (285, ("scarlet", "red")))
+
+@lru_cache(maxsize=4096)
 def suit(n):
     s = n.lower()
-    if "wands" in s: return "wands"
-    if "cups" in s: return "cups"
-    if "pentacles" in s or "coin" in s: return "pentacles"
-    if "swords" in s or "blade" in s: return "swords"
+    for name, needles in SUIT_RULES:
+        if any(x in s for x in needles): return name
     return "majors"
 
+@lru_cache(maxsize=1024)
 def map_freq(ray):
     r = (ray or "").lower()
-    if "violet" in r: return 963
-    if "indigo" in r or "silver" in r: return 852
-    if any(x in r for x in ["gold","emerald","green","aquamarine","turquoise"]): return 528
-    if "crimson" in r: return 417
-    if "scarlet" in r or "red" in r: return 285
+    for freq, needles in RAY_FREQS:
+        if any(x in r for x in needles): return freq
     return 432
 
-cards = []
-for b in blocks:
-    name = re.search(r"^##\s+(.+?)\s*$", b, re.M).group(1).strip()
-    _id = re.sub(r"[^\w]+", "_", name).lower()
-    ray = field(b, "Ray")
-    ad = field(b, "Angel/Demon")
-    angel, demon = "", ""
-    if "↔" in ad:
-        parts = [p.strip() for p in ad.split("↔")]
-        angel = parts[0] if parts else ""
-        demon = parts[1] if len(parts) > 1 else ""
-    crystal_line = field(b, "Crystal")
-    crystal = crystal_line.split("(")[0].strip() if crystal_line else ""
-    chem = re.search(r"\(([^)]+)\)", crystal_line)
-    chem = chem.group(1).strip() if chem else ""
-    tech = field(b, "Technical")
-    m = re.search(r"Solfeggio\s*=\s*([\d\.]+)", tech)
-    freq = float(m.group(1)) if m else float(map_freq(ray))
-    cards.append({
-        "id": _id, "name": name, "suit": suit(name),
-        "letter": field(b, "Letter"), "astrology": field(b, "Astrology"),
-        "ray": ray, "angel": angel, "demon": demon,
-        "deities": field(b, "Deities"),
-        "crystal": crystal, "chemistry": chem,
-        "artifact": field(b, "Artifact"), "pigment": field(b, "Pigment"),
-        "tara": field(b, "Secret Tara"), "thought": field(b, "Thought-form"),
-        "hga_fragment": field(b, "HGA Fragment"), "pattern_glyph": field(b, "Pattern Glyph"),
-        "psyche": field(b, "Psyche"), "technical": tech,
-        "appPulls": field(b, "App Pulls"), "freq": freq
-    })
-
-os.makedirs(os.path.dirname(OUT), exist_ok=True)
-with open(OUT, "w", encoding="utf-8") as f:
-    json.dump(cards, f, ensure_ascii=False, indent=2)
-print(f"Wrote {len(cards)} cards -> {OUT}")
+def iter_raw_blocks(lines):
+    """Yield (name, lines) per "## " block; text before the first header is skipped."""
+    name, body = None, None
+    for line in lines:
+        if line.startswith("##") and line[2:3].isspace():
+            if name is not None: yield name, body
+            m = HEADER.match(line) if line.startswith("## ") else None
+            name, body = (m.group(1).strip(), [line]) if m else (None, None)
+        elif name is not None:
+            body.append(line)
+    if name is not None: yield name, body
+
+def parse_fields(body):
+    """Collect "- Key: value" lines of a block; first occurrence wins."""
+    fields = {}
+    for line in body:
+        if "-" not in line: continue
+        m = FIELD_LINE.match(line)
+        if m and m.group(1) not in fields:
+            fields[m.group(1)] = m.group(2)
+    return fields
+
+def iter_blocks(lines):
+    """Yield (name, fields) per "## " block."""
+    for name, body in iter_raw_blocks(lines):
+        yield name, parse_fields(body[1:])
+
+def build_card(name, fields):
+    card = {"id": re.sub(r"[^\w]+", "_", name).lower(), "name": name, "suit": suit(name)}
+    for out, key, fn in FIELD_TABLE:
+        v = fields.get(key, "")
+        card[out] = fn(v) if fn and v else v
+    m = SOLFEGGIO.search(card["technical"])
+    card["freq"] = float(m.group(1)) if m else float(map_freq(card["ray"]))
+    return card
+
+def iter_cards(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for name, fields in iter_blocks(f):
+            yield build_card(name, fields)
+
+def compile_cards(source):
+    """Library entry point: cards for markdown text or any iterable of lines."""
+    lines = source.splitlines(True) if isinstance(source, str) else source
+    return [build_card(name, fields) for name, fields in iter_blocks(lines)]
+
+def index_path(out):
+    return os.path.splitext(out)[0] + ".idx"
+
+def write_cards(cards, out):
+    # Imported here so parsing (compile_cards) loads without tools/ on sys.path.
+    from cards_index import write_index
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(cards, f, ensure_ascii=False, indent=2)
+    write_index(cards, index_path(out))
+
+def block_hash(body):
+    return hashlib.sha1("".join(body).encode("utf-8")).hexdigest()
+
+def load_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cache if cache.get("version") == CACHE_VERSION else None
+
+def compile_incremental(inp, out, cache_path=None):
+    """Rebuild only blocks whose hash changed; return (cards, parsed, written)."""
+    cache_path = cache_path or out + ".cache.json"
+    cache = load_cache(cache_path)
+    fresh = cache is None
+    if fresh: cache = {"version": CACHE_VERSION, "order": [], "blocks": {}}
+    known, blocks, order, parsed = cache["blocks"], {}, [], 0
+    with open(inp, "r", encoding="utf-8") as f:
+        for name, body in iter_raw_blocks(f):
+            h = block_hash(body)
+            if h not in known:
+                known[h] = build_card(name, parse_fields(body[1:]))
+                parsed += 1
+            blocks[h] = known[h]
+            order.append(h)
+    cards = [blocks[h] for h in order]
+    if fresh or order != cache["order"]:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "order": order, "blocks": blocks}, f, ensure_ascii=False)
+    # Whitespace-only edits change hashes but not cards: leave the output alone.
+    prev = [known[h] for h in cache["order"] if h in known]
+    if not fresh and cards == prev and os.path.exists(out) and os.path.exists(index_path(out)):
+        return cards, parsed, False
+    write_cards(cards, out)
+    return cards, parsed, True
+
+def expand_sources(patterns):
+    """Expand paths/globs in order, dropping repeats."""
+    seen, out = set(), []
+    for pat in patterns:
+        for p in sorted(glob.glob(pat)) if glob.has_magic(pat) else [pat]:
+            if p not in seen:
+                seen.add(p)
+                out.append(p)
+    return out
+
+def _compile_source(path):
+    return path, list(iter_cards(path))
+
+def compile_batch(patterns, jobs=None):
+    """Parse sources concurrently; return (cards, duplicates) with per-card provenance."""
+    sources = expand_sources(patterns)
+    if jobs == 1 or len(sources) < 2:
+        results = map(_compile_source, sources)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_compile_source, sources))
+    merged, dupes = {}, 0
+    for path, cards in results:
+        for card in cards:
+            if card["id"] in merged:
+                dupes += 1
+                continue
+            card["source"] = path
+            merged[card["id"]] = card
+    return list(merged.values()), dupes
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compile Codex markdown into cards.json")
+    ap.add_argument("paths", nargs="*", help="[in_md] [out_json], or inputs/globs with --batch")
+    ap.add_argument("--incremental", action="store_true", help="reuse the sidecar block cache")
+    ap.add_argument("--batch", action="store_true", help="merge many inputs/globs in a process pool")
+    ap.add_argument("--out", default="assets/data/cards.json", help="output for --batch")
+    ap.add_argument("--jobs", type=int, help="worker processes for --batch (default: all cores)")
+    args = ap.parse_args(argv)
+    if args.batch:
+        if not args.paths: ap.error("--batch needs at least one input or glob")
+        cards, dupes = compile_batch(args.paths, args.jobs)
+        write_cards(cards, args.out)
+        print(f"Wrote {len(cards)} cards ({dupes} duplicates skipped) -> {args.out}")
+        return
+    if len(args.paths) > 2: ap.error("expected at most [in_md] [out_json]; use --batch for many inputs")
+    inp = args.paths[0] if len(args.paths)>0 else "docs/codex_abyssiae_master.md"
+    out = args.paths[1] if len(args.paths)>1 else "assets/data/cards.json"
+    if args.incremental:
+        cards, parsed, written = compile_incremental(inp, out)
+        if not written:
+            print(f"Up to date: {len(cards)} cards -> {out}")
+            return
+        print(f"Wrote {len(cards)} cards ({parsed} re-parsed) -> {out}")
+        return
+    cards = list(iter_cards(inp))
+    write_cards(cards, out)
+    print(f"Wrote {len(cards)} cards -> {out}")
+
+if __name__ == "__main__":
+    main()
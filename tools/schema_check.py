@@ -0,0 +1,227 @@
+# Schema Check -- JSON Schema subset compiled to straight-line Python validators
+# Usage: python tools/schema_check.py SCHEMA FILE [--each]
+#   FILE holds one record, or a list of records with --each (e.g. ASSET_CATALOG.json).
+#
+# compile_schema() turns a schema into the source of one function (inlined
+# type/required/enum/pattern/range checks, loops for array items, regexes
+# precompiled as constants) and execs it once. Validating a record is then
+# a single call that appends every (json-pointer, message) error it finds
+# instead of stopping at the first. Keywords: type, required, properties,
+# additionalProperties, items, enum, const, pattern, min/maxLength,
+# min/maxItems, minimum/maximum (+exclusive); annotations are ignored and
+# anything else is rejected at compile time rather than silently skipped.
+# Boolean schemas (true/false) work wherever a schema does, and enum/const
+# compare the JSON way: 1 equals 1.0, booleans never equal numbers.
+import json, os, re, sys
+
+from registry_cache import load_json
+
+ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "default", "examples"}
+KEYWORDS = ANNOTATIONS | {"type", "required", "properties", "additionalProperties", "items", "enum", "const",
+                          "pattern", "minLength", "maxLength", "minItems", "maxItems",
+                          "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"}
+TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool)) or (isinstance({v}, float) and {v}.is_integer()))",
+    "boolean": "isinstance({v}, bool)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "null": "{v} is None",
+}
+
+def json_equal(a, b):
+    """JSON Schema equality: 1 == 1.0, booleans never equal numbers, containers compare deeply."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)): return a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(json_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(json_equal(a[k], b[k]) for k in a)
+    return type(a) is type(b) and a == b
+
+def _trivial(schema):
+    """True for schemas that accept everything: ``true`` or annotations only."""
+    return schema is True or (isinstance(schema, dict) and not set(schema) - ANNOTATIONS)
+
+class _Gen:
+    def __init__(self):
+        self.lines, self.consts, self.n = [], {}, 0
+
+    def const(self, value):
+        name = f"K{len(self.consts)}"
+        self.consts[name] = value
+        return name
+
+    def var(self, prefix):
+        self.n += 1
+        return f"{prefix}{self.n}"
+
+    def emit(self, depth, line):
+        self.lines.append("    " * depth + line)
+
+    def fail(self, depth, path, msg):
+        self.emit(depth, f"errors.append(({path}, {msg}))")
+
+    def node(self, schema, v, path, depth):
+        """Emit checks for value expression ``v``; ``path`` is an expression, only evaluated on error."""
+        if schema is True: return
+        if schema is False:
+            self.fail(depth, path, repr("no value is allowed here"))
+            return
+        if not isinstance(schema, dict): raise ValueError(f"schema at {path} must be an object or boolean")
+        start, base = len(self.lines), depth
+        unknown = set(schema) - KEYWORDS
+        if unknown: raise ValueError(f"unsupported schema keyword(s) at {path}: {sorted(unknown)}")
+        types = schema.get("type")
+        if isinstance(types, str): types = [types]
+        if types:
+            for t in types:
+                if t not in TYPE_CHECKS: raise ValueError(f"unknown type {t!r}")
+            check = " or ".join(TYPE_CHECKS[t].format(v=v) for t in types)
+            self.emit(depth, f"if not ({check}):")
+            self.fail(depth + 1, path, repr(f"expected {' or '.join(types)}") + f" + ', got ' + type({v}).__name__")
+            self.emit(depth, "else:")
+            depth += 1
+            mark = len(self.lines)
+        if "enum" in schema:
+            if all(isinstance(e, str) for e in schema["enum"]):
+                k = self.const(frozenset(schema["enum"]))
+                self.emit(depth, f"if not (isinstance({v}, str) and {v} in {k}):")
+            else:
+                k = self.const(list(schema["enum"]))
+                self.emit(depth, f"if not any(json_equal({v}, e) for e in {k}):")
+            self.fail(depth + 1, path, repr(f"not one of {schema['enum']}"))
+        if "const" in schema:
+            k = self.const(schema["const"])
+            self.emit(depth, f"if not json_equal({v}, {k}):")
+            self.fail(depth + 1, path, repr(f"must equal {schema['const']!r}"))
+        self.strings(schema, v, path, depth, types)
+        self.numbers(schema, v, path, depth, types)
+        self.objects(schema, v, path, depth, types)
+        self.arrays(schema, v, path, depth, types)
+        if types and len(self.lines) == mark: self.lines.pop()  # no nested checks: drop the bare else
+        if len(self.lines) == start: self.emit(base, "pass")  # e.g. {"properties": {"x": {}}}
+
+    def _guard(self, types, kind, v, depth):
+        """Open an isinstance guard unless the declared type already guarantees ``kind``."""
+        if types == [kind] or (kind == "number" and types in (["integer"], ["number"])): return depth
+        self.emit(depth, f"if {TYPE_CHECKS[kind].format(v=v)}:")
+        return depth + 1
+
+    def strings(self, schema, v, path, depth, types):
+        if not ({"pattern", "minLength", "maxLength"} & set(schema)): return
+        depth = self._guard(types, "string", v, depth)
+        if "pattern" in schema:
+            k = self.const(re.compile(schema["pattern"]))
+            self.emit(depth, f"if {k}.search({v}) is None:")
+            self.fail(depth + 1, path, repr(f"does not match {schema['pattern']}"))
+        for key, op in (("minLength", "<"), ("maxLength", ">")):
+            if key in schema:
+                self.emit(depth, f"if len({v}) {op} {int(schema[key])}:")
+                self.fail(depth + 1, path, repr(f"{key} {schema[key]}"))
+
+    def numbers(self, schema, v, path, depth, types):
+        bounds = [(key, op) for key, op in (("minimum", "<"), ("maximum", ">"),
+                                            ("exclusiveMinimum", "<="), ("exclusiveMaximum", ">="))
+                  if key in schema]
+        if not bounds: return
+        depth = self._guard(types, "number", v, depth)
+        for key, op in bounds:
+            self.emit(depth, f"if {v} {op} {schema[key]!r}:")
+            self.fail(depth + 1, path, repr(f"{key} {schema[key]}"))
+
+    def objects(self, schema, v, path, depth, types):
+        props, extra = schema.get("properties", {}), schema.get("additionalProperties", True)
+        if _trivial(extra): extra = True
+        checked = {name: sub for name, sub in props.items() if not _trivial(sub)}
+        if not (schema.get("required") or checked or extra is not True): return
+        depth = self._guard(types, "object", v, depth)
+        for name in schema.get("required", []):
+            self.emit(depth, f"if {name!r} not in {v}:")
+            self.fail(depth + 1, path, repr(f"missing required property {name!r}"))
+        for name, sub in checked.items():
+            child = self.var("v")
+            self.emit(depth, f"{child} = {v}.get({name!r}, MISSING)")
+            self.emit(depth, f"if {child} is not MISSING:")
+            self.node(sub, child, f"{path} + {'/' + name.replace('~', '~0').replace('/', '~1')!r}", depth + 1)
+        if extra is not True:
+            known = self.const(frozenset(props))
+            key = self.var("k")
+            self.emit(depth, f"for {key} in {v}:")
+            self.emit(depth + 1, f"if {key} not in {known}:")
+            if extra is False:
+                self.fail(depth + 2, path, f"'unexpected property ' + repr({key})")
+            else:
+                child = self.var("v")
+                self.emit(depth + 2, f"{child} = {v}[{key}]")
+                self.node(extra, child, f"{path} + '/' + str({key})", depth + 2)
+
+    def arrays(self, schema, v, path, depth, types):
+        items = schema.get("items", True)
+        if not ({"minItems", "maxItems"} & set(schema) or not _trivial(items)): return
+        depth = self._guard(types, "array", v, depth)
+        for key, op in (("minItems", "<"), ("maxItems", ">")):
+            if key in schema:
+                self.emit(depth, f"if len({v}) {op} {int(schema[key])}:")
+                self.fail(depth + 1, path, repr(f"{key} {schema[key]}"))
+        if not _trivial(items):
+            i, child = self.var("i"), self.var("v")
+            self.emit(depth, f"for {i}, {child} in enumerate({v}):")
+            self.node(items, child, f"{path} + '/' + str({i})", depth + 1)
+
+def compile_source(schema, name="validate"):
+    """Python source and constants for ``schema``'s validator function."""
+    gen = _Gen()
+    gen.node(schema, "record", "''", 1)
+    src = "\n".join([f"def {name}(record, errors):"] + (gen.lines or ["    pass"]) + ["    return errors"])
+    return src, gen.consts
+
+class Validator:
+    """A schema compiled once; ``errors(record)`` lists every violation as (pointer, message)."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.source, consts = compile_source(schema)
+        namespace = dict(consts, MISSING=object(), json_equal=json_equal)
+        exec(compile(self.source, "<schema>", "exec"), namespace)
+        self._fn = namespace["validate"]
+
+    def errors(self, record):
+        return self._fn(record, [])
+
+    def is_valid(self, record):
+        return not self._fn(record, [])
+
+    def iter_errors(self, records):
+        """Yield (index, errors) for every invalid record in the stream."""
+        fn = self._fn
+        for i, record in enumerate(records):
+            errs = fn(record, [])
+            if errs: yield i, errs
+
+_compiled = {}
+
+def compile_schema(path):
+    """Validator for a schema file, recompiled only when the file changes."""
+    doc = load_json(path)
+    hit = _compiled.get(os.path.abspath(path))
+    if hit is None or hit[0] is not doc:
+        hit = _compiled[os.path.abspath(path)] = (doc, Validator(doc))
+    return hit[1]
+
+def main(argv):
+    if len(argv) < 2: print("usage: schema_check.py SCHEMA FILE [--each]", file=sys.stderr); return 2
+    validator = compile_schema(argv[0])
+    with open(argv[1], "r", encoding="utf-8") as f: data = json.load(f)
+    records = data if "--each" in argv else [data]
+    bad = 0
+    for i, errs in validator.iter_errors(records):
+        bad += 1
+        for pointer, msg in errs: print(f"{argv[1]}[{i}]{pointer or '/'}: {msg}")
+    print(f"{len(records) - bad}/{len(records)} valid", file=sys.stderr)
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
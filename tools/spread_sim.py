@@ -0,0 +1,139 @@
+# Spread Sim -- vectorized tarot spread simulation over the canonical 78-card deck
+# Usage: python tools/spread_sim.py [--spreads N] [--size K] [--reversals P] [--seed S] [--json OUT]
+#
+# The deck comes from card_registry (codex ids joined with the lattice nodes
+# and compiled cards) and is held as parallel integer code arrays: suit,
+# ray, freq, angel and demon, each with a label list (missing values code
+# to "unknown"). draw() deals a whole batch at once: a partial
+# Fisher-Yates shuffle over a (batch, 78) uint8 deck matrix, vectorized
+# across rows, so Python only loops over the K spread positions. simulate()
+# runs batches of CHUNK spreads through draw() and accumulates bincount
+# tallies, so memory stays flat however many spreads are requested.
+import json, sys, time
+
+import numpy as np
+
+from card_registry import CardRegistry
+
+CHUNK = 1 << 16
+ATTRS = ("suit", "ray", "freq", "angel", "demon")
+
+def _codes(values):
+    labels, index, codes = ["unknown"], {"unknown": 0}, []
+    for v in values:
+        key = "unknown" if v in (None, "") else str(v)
+        if key not in index: index[key] = len(labels); labels.append(key)
+        codes.append(index[key])
+    return np.array(codes, dtype=np.int64), labels
+
+class Deck:
+    def __init__(self, cards):
+        """``cards``: dicts with id plus any of ATTRS."""
+        self.ids = [c["id"] for c in cards]
+        self.codes, self.labels = {}, {}
+        for attr in ATTRS:
+            self.codes[attr], self.labels[attr] = _codes(c.get(attr) for c in cards)
+
+    def __len__(self): return len(self.ids)
+
+    @classmethod
+    def canonical(cls, registry=None):
+        """The 78 codex cards, attributes filled from the lattice node or compiled card when joined."""
+        registry = registry or CardRegistry.load()
+        cards = []
+        for cid in registry.canonical:
+            view = registry.views[cid]
+            extra = view["node"] or view["card"] or {}
+            cards.append({"id": cid, "suit": view["suit"], "ray": extra.get("ray"), "freq": extra.get("freq"),
+                          "angel": extra.get("angel"), "demon": extra.get("demon")})
+        return cls(cards)
+
+def draw(n_cards, n_spreads, size, rng, reversals=0.0):
+    """(cards, reversed): (n_spreads, size) card indices without repeats per spread, and reversal flags."""
+    if not 0 < size <= n_cards: raise ValueError(f"spread size {size} outside 1..{n_cards}")
+    deck = np.tile(np.arange(n_cards, dtype=np.uint8 if n_cards <= 256 else np.uint16), (n_spreads, 1))
+    rows = np.arange(n_spreads)
+    for j in range(size):
+        pick = rng.integers(j, n_cards, n_spreads)
+        chosen = deck[rows, pick]
+        deck[rows, pick] = deck[:, j]
+        deck[:, j] = chosen
+    cards = deck[:, :size].astype(np.int64)
+    flipped = rng.random((n_spreads, size)) < reversals if reversals else np.zeros((n_spreads, size), dtype=bool)
+    return cards, flipped
+
+def simulate(deck, n_spreads, size=10, reversals=0.5, seed=0, chunk=CHUNK):
+    """Tallies over ``n_spreads`` spreads; every array is a plain count, see summarize()."""
+    rng = np.random.default_rng(seed)
+    n = len(deck)
+    L = {a: len(deck.labels[a]) for a in ATTRS}
+    stats = {
+        "spreads": 0, "size": size,
+        "card": np.zeros(n, dtype=np.int64), "reversed": np.zeros(n, dtype=np.int64),
+        "position_suit": np.zeros((size, L["suit"]), dtype=np.int64),
+        "suit_per_spread": np.zeros((L["suit"], size + 1), dtype=np.int64),
+        "angel_demon": np.zeros((L["angel"], L["demon"]), dtype=np.int64),
+    }
+    done = 0
+    while done < n_spreads:
+        b = min(chunk, n_spreads - done)
+        cards, flipped = draw(n, b, size, rng, reversals)
+        flat = cards.ravel()
+        stats["card"] += np.bincount(flat, minlength=n)
+        stats["reversed"] += np.bincount(flat, weights=flipped.ravel(), minlength=n).astype(np.int64)
+        suits = deck.codes["suit"][cards]
+        stats["position_suit"] += np.bincount((np.arange(size) * L["suit"] + suits).ravel(),
+                                              minlength=size * L["suit"]).reshape(size, L["suit"])
+        rows = np.repeat(np.arange(b), size)
+        per_spread = np.bincount(rows * L["suit"] + suits.ravel(), minlength=b * L["suit"]).reshape(b, -1)
+        stats["suit_per_spread"] += np.bincount((np.arange(L["suit"]) * (size + 1) + per_spread).ravel(),
+                                                minlength=L["suit"] * (size + 1)).reshape(L["suit"], -1)
+        # Angel of one card meeting the demon of another in the same spread
+        # (float matmul is BLAS-backed and exact for counts below 2**53).
+        angels = np.bincount(rows * L["angel"] + deck.codes["angel"][flat], minlength=b * L["angel"]).reshape(b, -1)
+        demons = np.bincount(rows * L["demon"] + deck.codes["demon"][flat], minlength=b * L["demon"]).reshape(b, -1)
+        same_card = np.bincount(deck.codes["angel"][flat] * L["demon"] + deck.codes["demon"][flat],
+                                minlength=L["angel"] * L["demon"]).reshape(L["angel"], L["demon"])
+        stats["angel_demon"] += np.rint(angels.T.astype(np.float64) @ demons).astype(np.int64) - same_card
+        done += b
+    stats["spreads"] = n_spreads
+    # Attribute tallies follow from the per-card counts; no per-draw work needed.
+    for a in ATTRS: stats[a] = np.bincount(deck.codes[a], weights=stats["card"], minlength=L[a]).astype(np.int64)
+    return stats
+
+def summarize(deck, stats, top=5):
+    """JSON-friendly view: labelled distributions as fractions, top cards and angel/demon pairs."""
+    total = stats["spreads"] * stats["size"]
+    out = {"spreads": stats["spreads"], "size": stats["size"]}
+    for a in ATTRS:
+        out[a] = {deck.labels[a][i]: round(c / total, 6) for i, c in enumerate(stats[a]) if c}
+    order = np.argsort(-stats["card"], kind="stable")[:top]
+    out["top_cards"] = [[deck.ids[i], int(stats["card"][i])] for i in order]
+    out["reversal_rate"] = round(float(stats["reversed"].sum() / max(total, 1)), 6)
+    pairs = stats["angel_demon"].copy()
+    pairs[0, :] = pairs[:, 0] = 0  # drop pairs involving unknowns
+    flat = np.argsort(-pairs, axis=None, kind="stable")[:top]
+    out["angel_demon"] = [[deck.labels["angel"][i // pairs.shape[1]], deck.labels["demon"][i % pairs.shape[1]],
+                           int(pairs.flat[i])] for i in flat if pairs.flat[i]]
+    out["suit_per_spread"] = {deck.labels["suit"][s]: stats["suit_per_spread"][s].tolist()
+                              for s in range(len(deck.labels["suit"])) if stats["suit"][s]}
+    return out
+
+def main(argv):
+    opts = {"--spreads": 1_000_000, "--size": 10, "--reversals": 0.5, "--seed": 0, "--json": None}
+    it = iter(argv)
+    for a in it:
+        if a in opts: opts[a] = next(it)
+    deck = Deck.canonical()
+    t = time.perf_counter()
+    stats = simulate(deck, int(opts["--spreads"]), int(opts["--size"]), float(opts["--reversals"]), int(opts["--seed"]))
+    secs = time.perf_counter() - t
+    summary = summarize(deck, stats)
+    print(f"{stats['spreads']:,} spreads of {stats['size']} from {len(deck)} cards in {secs:.2f} s")
+    print(json.dumps({k: summary[k] for k in ("suit", "ray", "top_cards", "angel_demon", "reversal_rate")}, ensure_ascii=False))
+    if opts["--json"]:
+        with open(opts["--json"], "w", encoding="utf-8") as f: json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,218 @@
+# Toggle Engine -- toggle effect lists compiled to fused NumPy colour pipelines
+# Usage: python tools/toggle_engine.py [TOGGLE_ID ...] [--palette PATH ...] [--batch N]
+#
+# A toggle (toggles/<id>.toggle.json) lists effects:
+#   overlay        {"name" | "color", "intensity"}  lerp every pixel toward a tint
+#   palette_blend  {"tokens", "amount"}             mix in a luminance gradient through the token colours
+#   unlock         {"target", "mode"}                no pixel work; reported as an unlock
+# compile_toggle() folds the effect list into stages of the form
+#   out = s * x + c + H[lum(x)]
+# Overlays only scale and tint, so consecutive ones multiply into the
+# per-channel s/c, and a blend's 256-entry gradient table H is pushed
+# through the overlays after it. Each stage then compiles to one uint8
+# table per channel indexed by (value, luminance), with luminance in 8.8
+# fixed point: a pass over the batch is a few integer ops and three table
+# gathers per pixel, however many effects fused into it. Only a second
+# blend starts a new stage. Palettes (data/palette.json, palette.v2.json)
+# go through the same stages as an (n, 3) image. ToggleEngine caches the
+# compiled pipeline per toggle id until the toggle or
+# export/toggle_manifest.json changes on disk.
+#
+# The safety block is enforced while compiling, with SAFE as the default:
+#   strobe false   flashing effects (FLASHING types, or any "hz") are rejected
+#   motion         caps overlay intensity / blend amount at MOTION_LIMITS
+#   autoplay false unlocks are held until the caller confirms them
+# A manifest with "nd_safe": true forces strobe and autoplay off for every toggle.
+import glob, json, os, sys, time
+
+import numpy as np
+
+from card_registry import title_key
+from registry_cache import load_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST = os.path.join("export", "toggle_manifest.json")
+PALETTES = (os.path.join("data", "palette.json"), os.path.join("data", "palette.v2.json"))
+SAFE = {"strobe": False, "autoplay": False, "motion": "calm"}
+MOTION_LIMITS = {"still": 0.3, "calm": 0.6, "full": 1.0}
+FLASHING = {"strobe", "flash", "flicker"}
+OVERLAYS = {"calm": "#b1c7ff", "warm": "#ffe3a4", "dusk": "#f5b8ff", "veil": "#0b0b12"}
+TOKENS = {"rose-quartz": "#f7cac9", "teal-glow": "#2ec4b6", "ink": "#f0f0ff", "void": "#0b0b12"}
+LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+CHUNK = 1 << 18  # pixels per uint32 working block
+
+def hex_rgb(value):
+    value = TOKENS.get(value, value)
+    if not (isinstance(value, str) and value.startswith("#") and len(value) == 7):
+        raise ValueError(f"unknown colour token {value!r}")
+    return np.array([int(value[i:i + 2], 16) for i in (1, 3, 5)], dtype=np.float32)
+
+def rgb_hex(rgb):
+    return "#" + "".join(f"{int(v):02x}" for v in rgb)
+
+def gradient(colours, size=256):
+    """(size, 3) table running through ``colours`` evenly from dark to light luminance."""
+    stops = np.array([hex_rgb(c) for c in colours], dtype=np.float32)
+    if len(stops) == 1: return np.repeat(stops, size, axis=0)
+    xs, at = np.linspace(0, size - 1, len(stops)), np.arange(size)
+    return np.stack([np.interp(at, xs, stops[:, ch]) for ch in range(3)], axis=1).astype(np.float32)
+
+class Stage:
+    """out = s * x + c (+ H[round(k . x + k0)] when H is set), per channel."""
+
+    def __init__(self):
+        self.s, self.c = np.ones(3, dtype=np.float32), np.zeros(3, dtype=np.float32)
+        self.k = self.k0 = self.H = None
+        self._tables = None
+
+    def affine(self, s, c):
+        self.s, self.c = self.s * s, self.c * s + c
+        if self.H is not None: self.H = self.H * s
+        self._tables = None
+
+    def blend(self, table, amount):
+        self.k, self.k0 = self.s * LUMA, float(self.c @ LUMA)
+        self.s, self.c, self.H = self.s * (1 - amount), self.c * (1 - amount), table * amount
+        self._tables = None
+
+    def tables(self):
+        """Per-channel uint8 tables: 256 entries, or 256 x len(H) flattened as (value << 8) | lum."""
+        if self._tables is None:
+            v = np.arange(256, dtype=np.float32)[:, None]
+            extra = self.H[None, :, :] if self.H is not None else np.zeros((1, 1, 3), dtype=np.float32)
+            full = np.clip(np.rint(self.s * v[:, :, None] + self.c + extra), 0, 255).astype(np.uint8)
+            self._tables = [np.ascontiguousarray(full[:, :, j]).ravel() for j in range(3)]
+            if self.H is not None:
+                self._kq = np.rint(self.k * 256).astype(np.uint32)
+                self._k0q = np.uint32(round((self.k0 + 0.5) * 256))
+        return self._tables
+
+    def run(self, planes):
+        """(3, n) uint32 channel planes -> (3, n) uint8, via the channel tables."""
+        tables = self.tables()
+        if self.H is None: return np.stack([tables[j].take(planes[j]) for j in range(3)])
+        lum = planes[0] * self._kq[0]
+        lum += planes[1] * self._kq[1]; lum += planes[2] * self._kq[2]; lum += self._k0q
+        lum >>= 8
+        np.minimum(lum, len(self.H) - 1, out=lum)
+        out = np.empty(planes.shape, dtype=np.uint8)
+        for j in range(3): out[j] = tables[j].take((planes[j] << 8) | lum)
+        return out
+
+class Pipeline:
+    def __init__(self, toggle_id, stages, unlocks, safety):
+        self.id, self.stages, self.unlocks, self.safety = toggle_id, stages, unlocks, safety
+
+    def apply(self, images, out=None):
+        """Run every stage over a uint8 (..., 3) batch in CHUNK-pixel blocks; returns uint8."""
+        images = np.asarray(images)
+        if images.shape[-1:] != (3,): raise ValueError(f"expected (..., 3) RGB, got {images.shape}")
+        src = images.reshape(-1, 3)
+        if out is None: out = np.empty(images.shape, dtype=np.uint8)
+        dst = out.reshape(-1, 3)
+        for lo in range(0, len(src), CHUNK):
+            x = src[lo:lo + CHUNK]
+            for stage in self.stages: x = stage.run(x.T.astype(np.uint32, order="C")).T
+            dst[lo:lo + CHUNK] = x
+        return out
+
+    def apply_palette(self, palette):
+        """Same keys as ``palette`` ({bg, ink, layers: [...]}, hex strings) with every colour run through."""
+        flat = [(k, None, v) for k, v in palette.items() if isinstance(v, str)]
+        flat += [(k, i, v) for k, vs in palette.items() if isinstance(vs, list) for i, v in enumerate(vs)]
+        rgb = self.apply(np.array([hex_rgb(v) for _, _, v in flat], dtype=np.uint8)) if flat else []
+        out = {k: (list(v) if isinstance(v, list) else v) for k, v in palette.items()}
+        for (k, i, _), colour in zip(flat, rgb):
+            if i is None: out[k] = rgb_hex(colour)
+            else: out[k][i] = rgb_hex(colour)
+        return out
+
+    def ready_unlocks(self, confirmed=False):
+        """Unlocks to fire now: all of them under autoplay, otherwise only once the user confirms."""
+        return list(self.unlocks) if self.safety["autoplay"] or confirmed else []
+
+def compile_toggle(toggle, nd_safe=True):
+    """Pipeline for a parsed toggle; raises ValueError on effects its safety block forbids."""
+    tid = toggle.get("id", "?")
+    safety = {**SAFE, **(toggle.get("safety") or {})}
+    if nd_safe: safety["strobe"] = safety["autoplay"] = False
+    if safety["motion"] not in MOTION_LIMITS: raise ValueError(f"{tid}: unknown motion {safety['motion']!r}")
+    limit = MOTION_LIMITS[safety["motion"]]
+    stages, unlocks = [Stage()], []
+    for fx in toggle.get("effects", []):
+        kind = fx.get("type")
+        if not safety["strobe"] and (kind in FLASHING or "hz" in fx):
+            raise ValueError(f"{tid}: {kind} effect needs safety.strobe")
+        if kind == "overlay":
+            tint = hex_rgb(fx["color"] if "color" in fx else OVERLAYS.get(fx.get("name"), fx.get("name")))
+            a = min(float(fx.get("intensity", 0.5)), limit)
+            stages[-1].affine(np.float32(1 - a), tint * a)
+        elif kind == "palette_blend":
+            if stages[-1].H is not None: stages.append(Stage())
+            stages[-1].blend(gradient(fx["tokens"]), min(float(fx.get("amount", 0.5)), limit))
+        elif kind == "unlock":
+            unlocks.append({"target": fx["target"], "mode": fx.get("mode")})
+        else:
+            raise ValueError(f"{tid}: unsupported effect type {kind!r}")
+    return Pipeline(tid, stages, unlocks, safety)
+
+class ToggleEngine:
+    def __init__(self, root=ROOT):
+        self.root = root
+        self._compiled = {}
+
+    def path(self, toggle_id):
+        return os.path.join(self.root, "toggles", f"{toggle_id}.toggle.json")
+
+    def toggle_ids(self):
+        return sorted(os.path.basename(p)[:-len(".toggle.json")]
+                      for p in glob.glob(os.path.join(self.root, "toggles", "*.toggle.json")))
+
+    def manifest(self):
+        path = os.path.join(self.root, MANIFEST)
+        return load_json(path) if os.path.exists(path) else {}
+
+    def compile(self, toggle_id):
+        """Cached Pipeline for ``toggle_id``; recompiled when the toggle or manifest changes."""
+        doc, manifest = load_json(self.path(toggle_id)), self.manifest()
+        hit = self._compiled.get(toggle_id)
+        if hit is None or hit[0] is not doc or hit[1] is not manifest:
+            hit = self._compiled[toggle_id] = (doc, manifest, compile_toggle(doc, manifest.get("nd_safe", True)))
+        return hit[2]
+
+    def apply(self, toggle_id, images, out=None):
+        return self.compile(toggle_id).apply(images, out)
+
+    def apply_palette(self, toggle_id, palette):
+        return self.compile(toggle_id).apply_palette(palette)
+
+    def layer(self, title):
+        """The manifest's {GEOMETRY, SLOT, SPELL} entry for a card title, or None."""
+        key = title_key(title)
+        for name, entry in self.manifest().get("layer_map", {}).items():
+            if title_key(name) == key: return entry
+        return None
+
+def main(argv):
+    ids, palettes, batch = [], [], 64
+    it = iter(argv)
+    for a in it:
+        if a == "--palette": palettes.append(next(it))
+        elif a == "--batch": batch = int(next(it))
+        else: ids.append(a)
+    engine = ToggleEngine()
+    images = np.random.default_rng(0).integers(0, 256, (batch, 256, 256, 3), dtype=np.uint8)
+    for tid in ids or engine.toggle_ids():
+        pipe = engine.compile(tid)
+        out = np.empty_like(images)
+        t = time.perf_counter(); pipe.apply(images, out); secs = time.perf_counter() - t
+        print(f"{tid}: {len(pipe.stages)} stage(s), safety {pipe.safety}, "
+              f"{images.size // 3 / secs / 1e6:.1f} Mpx/s over {batch} x 256x256")
+        held = "" if pipe.ready_unlocks() else ", held until confirmed"
+        for u in pipe.unlocks: print(f"  unlock {u['target']} ({u['mode']}){held}")
+        for rel in palettes or PALETTES:
+            print(f"  {rel}: {json.dumps(pipe.apply_palette(load_json(os.path.join(ROOT, rel))))}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))